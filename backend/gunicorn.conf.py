@@ -0,0 +1,40 @@
+"""
+Gunicorn configuration for running the FastAPI backend on multiple cores.
+
+Launch (from the backend directory, or /app in the Docker image):
+    gunicorn main:app -c gunicorn.conf.py
+
+Each worker is a separate process running uvicorn, so a blocking HyperSpy
+operation in one worker doesn't stall requests handled by the others.
+"""
+
+import os
+import multiprocessing
+
+# Cloud Run sets PORT; default matches the Dockerfile's EXPOSE
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+
+workers = int(os.getenv("WEB_CONCURRENCY", 4))
+# UvicornWorker uses uvloop and httptools when they are installed
+# (uvicorn[standard] in requirements.txt), falling back to asyncio/h11
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import main once in the master before forking workers. HyperSpy isn't part
+# of that: it is imported lazily (operations/file_functions.py), so each worker
+# imports it in its lifespan warm-up (_warm_hyperspy in main.py) instead
+preload_app = True
+
+# Recycle workers periodically to cap memory growth from cached signals
+max_requests = 1000
+max_requests_jitter = 100
+
+# Loading large files can take a while; don't kill workers mid-load
+timeout = 120
+
+# Every worker creates its own process pool for region/energy-range math
+# (see lifespan in main.py). Split the cores between workers instead of giving
+# each worker a pool the size of the whole machine.
+os.environ.setdefault(
+    "CRUCIBLE_PROCESS_WORKERS",
+    str(max(1, multiprocessing.cpu_count() // workers))
+)
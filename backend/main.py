@@ -7,7 +7,8 @@ the frontend and backend services. Here's the architecture:
 1. Frontend -> Backend (main.py):
    - Frontend api.ts makes HTTP requests to endpoints here
    - Each endpoint maps to a frontend function
-   - Example: frontend getSpectrum() -> GET /spectrum endpoint
+   - All endpoints are served under the /api prefix (APIRouter below)
+   - Example: frontend getSpectrum() -> GET /api/spectrum endpoint
 
 2. Main -> Service Layer:
    - Endpoints delegate to service handlers (service_handlers/*.py)
@@ -29,19 +30,50 @@ the frontend and backend services. Here's the architecture:
    - All errors are logged and propagated up
 """
 
-from fastapi import FastAPI, Query, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, Query, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles #Allows displaying of Crucible Data Explorer App
-import hyperspy.api as hs
+from starlette.exceptions import HTTPException as StarletteHTTPException
+import httpx
+import anyio
+import asyncio
+import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
 import time
-from service_handlers import file_service, signal_service, data_service
-print("=== IMPORTING ORCID SERVICE ===")
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from service_handlers import file_service, signal_service, data_service, compute_workers
+from service_handlers.region_batcher import RegionSpectrumBatcher
 from external_services import orcid_service
-print("=== ORCID SERVICE IMPORTED SUCCESSFULLY ===")
-from operations import periodic_table_functions
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from dataclasses import dataclass, asdict
+from cachetools import TTLCache
+from typing import Annotated, Any, Literal, Optional
+from utils.responses import array_response, spectrum_array_response, image_array_response
+from utils import response_cache
+
+
+# Logging goes through a queue: request handlers only enqueue the record, and a
+# background thread (the QueueListener, started in lifespan) formats it and
+# writes it to stderr. Handlers never block on stdout/stderr writes.
+# Set CRUCIBLE_LOG_LEVEL=DEBUG to see the per-request trace.
+logger = logging.getLogger("crucible")
+# The operations/services modules log under their own module names
+for _name in ("crucible", "operations", "service_handlers"):
+    logging.getLogger(_name).setLevel(os.getenv("CRUCIBLE_LOG_LEVEL", "INFO").upper())
+
+_log_queue = queue.Queue(-1)
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler, respect_handler_level=True)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
 
 
 
@@ -54,42 +86,204 @@ from pydantic import BaseModel
 
 
 
+def _warm_hyperspy():
+    """
+    Pays HyperSpy's one-time costs at startup instead of on the first user request.
+    Imports the file reader plugins and runs a reduction on a tiny in-memory signal
+    so numpy/dask code paths are loaded, and compiles the Numba FWHM kernel. If CRUCIBLE_WARMUP_FILE points to a small
+    data file, it is loaded once as well so its reader is fully initialized.
+    """
+    import hyperspy.api as hs
+    import hyperspy.io_plugins  # noqa: F401  (resolves all file-format readers)
+    import numpy as np
+    from operations import data_functions
+
+    hs.signals.Signal1D(np.zeros((2, 2, 4))).sum()
+    data_functions.warm_up_fwhm_kernel()
+
+    warmup_file = os.getenv("CRUCIBLE_WARMUP_FILE")
+    if warmup_file and os.path.exists(warmup_file):
+        hs.load(warmup_file)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup/shutdown hook for the FastAPI app.
+
+    Starts the background logging thread (see logger above).
+    Sizes the threadpool that runs the blocking HyperSpy calls
+    (run_in_threadpool) from CRUCIBLE_THREADPOOL_SIZE, defaulting to AnyIO's 40.
+
+    Warms up HyperSpy (see _warm_hyperspy) so the first /signals or /spectrum
+    request doesn't pay the import/plugin cost.
+    Creates the process pool used by the CPU-bound region and energy-range
+    endpoints. Workers are spawned rather than forked so they don't inherit
+    open HDF5 handles or threads from this process; each worker loads and
+    caches files on its own (see service_handlers/compute_workers.py).
+    """
+    # Started here rather than at import so each gunicorn worker runs its own
+    # listener thread after the fork
+    _log_listener.start()
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(
+        os.getenv("CRUCIBLE_THREADPOOL_SIZE", 40)
+    )
+
+    await asyncio.to_thread(_warm_hyperspy)
+
+    max_workers = int(os.getenv("CRUCIBLE_PROCESS_WORKERS", os.cpu_count() or 1))
+    app.state.pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    yield
+    app.state.pool.shutdown()
+    _log_listener.stop()
+
+
+async def run_in_process_pool(func, *args):
+    """Runs a module-level function from compute_workers on the app's process pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.pool, func, *args)
+
+
+# Requests currently being computed, keyed by endpoint + parameters
+_inflight = {}
+
+async def single_flight(key, run, *args):
+    """
+    Awaits run(*args), sharing the result with identical requests that arrive
+    while it is running. run is usually run_in_threadpool or run_in_process_pool,
+    with the service function as the first argument.
+
+    React StrictMode (and client retries) fire the same GET twice within a few ms.
+    Instead of loading and reducing the file twice, the second request waits on
+    the task started for the first one.
+
+    Args:
+        key (tuple): Hashable identity of the request, e.g. ("spectrum", ref)
+        run: Coroutine function doing the work off the event loop
+        *args: Arguments passed to run
+
+    Returns:
+        The result of run(*args)
+    """
+    task = _inflight.get(key)
+    if task is None:
+        # The work runs in its own task, owned by no caller, so cancelling any
+        # one waiter (the first included) can't cancel it for the others.
+        # _inflight holds the only strong reference until it is done.
+        task = asyncio.ensure_future(run(*args))
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _finish_flight(key, done))
+
+    # shield: a disconnecting caller must not cancel the shared work
+    return await asyncio.shield(task)
+
+
+def _finish_flight(key, task):
+    """Done callback of a single_flight task"""
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # Mark as retrieved in case every waiter went away
+
+
+# Region requests for the same signal arriving within 20ms go to the process
+# pool as one batch (see service_handlers/region_batcher.py)
+region_batcher = RegionSpectrumBatcher(run_in_process_pool)
+
+
 # Create FastAPI instance
-app = FastAPI()
+# ORJSONResponse serializes NumPy arrays natively, so the spectrum and image
+# endpoints can hand back ndarrays without converting them to Python lists
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 
-### THIS SECTION OF CODE IS FOR DEVELOPMENT ONLY ###
-### MUST ADD SECURITY FOR PRODUCTION ###
 # Configure CORS (Cross-Origin Resource Sharing)
+# Only needed in development, where the Vite dev server (port 5173) calls the
+# backend on port 8000. In production the frontend is served by this app, so
+# requests are same-origin. Set FRONTEND_ORIGIN (comma-separated) to allow others.
+# Browsers cache the preflight response for max_age seconds (one day), so
+# OPTIONS round-trips aren't repeated for every API call.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # More permissive for development
+    allow_origins=os.getenv("FRONTEND_ORIGIN", "http://localhost:5173").split(","),
     allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],
-    max_age=3600,
+    allow_methods=["GET", "POST"],  # POST is only used by the ORCID code exchange
+    allow_headers=["content-type", "accept"],
+    expose_headers=["X-Shape", "X-Dtype", "X-Metadata"],  # Headers of ?format=binary responses
+    max_age=86400,
 )
 
-# Mount static files directory to serve React build files
-# Mount assets directory so /assets/... requests work directly (React build expects this)
+# Compress responses over 1 KB. Image and spectrum payloads are long runs of
+# ASCII digits and shrink several times over, which cuts transfer time for
+# remote browsers. Small responses are left alone.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+@app.get("/healthz")
+async def healthz():
+    """
+    Health check for load balancer probes.
+    Returns immediately without touching HyperSpy or any data files.
+    """
+    return {"status": "ok"}
+
+
+# The React build (static/) is mounted at the bottom of this file, after all
+# API routes, so it only sees requests that no endpoint matched.
 # This directory should be built during docker deployment
-app.mount("/assets", StaticFiles(directory="static/assets"), name="assets")
 
-# Mount main static files for favicon and other root-level static files
-# This allows /2020LBL_Favicon.ico to be served directly
 
-# Create a custom static file handler for root-level files
-@app.get("/2020LBL_Favicon.ico")
-async def favicon():
-    from fastapi.responses import FileResponse
-    return FileResponse("static/2020LBL_Favicon.ico")
+class SPAStaticFiles(StaticFiles):
+    """
+    Serves the React build and falls back to index.html for unknown paths.
+
+    StaticFiles(html=True) only serves index.html for directories, so client-side
+    routes such as /orcid/callback would 404 on refresh. Any path that is not
+    a real file gets the React app instead and React Router handles it.
+
+    Caching:
+    - assets/ holds Vite's content-hashed bundles, so browsers may keep them
+      for a year without revalidating.
+    - The favicons aren't hashed but practically never change; cached for a day.
+    - The index.html fallback is read from disk once and served from memory
+      afterwards, instead of a stat + open per client-side route. It is sent with
+      no-cache because it changes on every deploy and points at the new bundles.
+    """
+    ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+    FAVICON_CACHE_CONTROL = "public, max-age=86400"
+    FAVICONS = ("2020LBL_Favicon.ico", "2020-Favicon-Template-228x228_v3.png")
+
+    _index_html = None
+
+    async def get_response(self, path: str, scope):
+        try:
+            response = await super().get_response(path, scope)
+        except StarletteHTTPException as e:
+            if e.status_code != 404:
+                raise
+            return self._index_response()
+
+        if response.status_code == 200:
+            if path.startswith("assets/"):
+                response.headers["Cache-Control"] = self.ASSET_CACHE_CONTROL
+            elif path in self.FAVICONS:
+                response.headers["Cache-Control"] = self.FAVICON_CACHE_CONTROL
+        return response
 
-@app.get("/2020-Favicon-Template-228x228_v3.png")  
-async def favicon_png():
-    from fastapi.responses import FileResponse
-    return FileResponse("static/2020-Favicon-Template-228x228_v3.png")
+    def _index_response(self) -> Response:
+        """Returns index.html from memory, reading it on first use"""
+        if self._index_html is None:
+            with open(os.path.join(self.directory, "index.html"), "rb") as f:
+                self._index_html = f.read()
+        return Response(
+            content=self._index_html,
+            media_type="text/html",
+            headers={"Cache-Control": "no-cache"}
+        )
 
 
 
@@ -99,37 +293,196 @@ async def favicon_png():
 ######################## End FastAPI server block ##############################
 
 
+# All API endpoints are registered on this router and served under /api.
+# Keeping them under one prefix separates them from the React app, which is
+# mounted at / (see bottom of file).
+api = APIRouter(prefix="/api")
+
+# Browser caching for payloads that only change when a data file changes
+# (server-side they are cached in utils/response_cache.py). Short enough that a
+# replaced file shows up quickly, long enough to absorb StrictMode duplicates.
+DATA_CACHE_HEADERS = {"Cache-Control": "private, max-age=30"}
+FILE_LIST_CACHE_HEADERS = {"Cache-Control": "private, max-age=5"}
+# Endpoints that pick JSON or binary from the Accept header (see wants_binary)
+# must tell caches that the same URL has two bodies
+VARY_ACCEPT_HEADERS = {"Vary": "Accept"}
+NEGOTIATED_CACHE_HEADERS = {**DATA_CACHE_HEADERS, **VARY_ACCEPT_HEADERS}
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match header already matches etag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+
+def not_modified_response(etag: str, cache_headers: dict = DATA_CACHE_HEADERS) -> Response:
+    """304 response telling the browser to reuse its cached copy"""
+    return Response(status_code=304, headers={"ETag": etag, **cache_headers})
+
+# Endpoints returning numeric arrays accept ?format=binary to receive raw
+# array bytes (see utils/responses.py) instead of JSON
+ResponseFormat = Literal["json", "binary"]
+
+
+def wants_binary(response_format: str, request: Request) -> bool:
+    """
+    True if the client asked for raw array bytes, either with ?format=binary
+    or by sending Accept: application/octet-stream
+    """
+    return (response_format == "binary"
+            or "application/octet-stream" in request.headers.get("accept", ""))
+
+
+@dataclass(frozen=True)
+class SignalRef:
+    """
+    Identifies one signal inside a data file.
+    Shared by every endpoint that takes filename + signal_idx, so the query
+    parameters are declared and validated in one place.
+    """
+    filename: str
+    signal_idx: int
+
+
+def signal_ref(
+    filename: str = Query(..., description="Name of the file"),
+    signal_idx: int = Query(..., description="Index of the signal in the file")
+) -> SignalRef:
+    return SignalRef(filename=filename, signal_idx=signal_idx)
+
+
+SignalRefDep = Annotated[SignalRef, Depends(signal_ref)]
+
+
+@dataclass(frozen=True)
+class Region:
+    """
+    Rectangular selection on an image, in pixel coordinates.
+    x1 <= x2 and y1 <= y2 are guaranteed, all values are >= 0.
+    """
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+
+
+def region_query(
+    x1: int = Query(..., description="First corner, x"),
+    y1: int = Query(..., description="First corner, y"),
+    x2: int = Query(..., description="Opposite corner, x"),
+    y2: int = Query(..., description="Opposite corner, y")
+) -> Region:
+    """
+    Validates region coordinates before any file is touched.
+    Corners may come in either order (selections dragged up or left) and may
+    overhang the image edge slightly; both are normalized. Empty regions are
+    rejected with 422. The image size isn't known here, so a region entirely
+    outside the image is only caught when it is clamped to the signal (see
+    SignalService._region_bounds), where that region fails on its own.
+    """
+    x1, x2 = sorted((x1, x2))
+    y1, y2 = sorted((y1, y2))
+    x1, y1 = max(x1, 0), max(y1, 0)
+    if x2 <= x1 or y2 <= y1:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Region ({x1}, {y1}) to ({x2}, {y2}) contains no pixels"
+        )
+    return Region(x1=x1, y1=y1, x2=x2, y2=y2)
+
+
+RegionDep = Annotated[Region, Depends(region_query)]
+
+
+# Response models for the hot data endpoints.
+# They are passed as response_model= so the payload shape shows up in the
+# OpenAPI docs. The endpoints still return ORJSONResponse directly, and FastAPI
+# skips validating/re-encoding a returned Response, so the models add no
+# per-request cost: orjson serializes the dicts (and ndarrays) as they are.
+
+class SpectrumResponse(BaseModel):
+    """
+    Response model for /spectrum.
+
+    Attributes:
+        x: Energy values of the signal axis
+        y: Summed intensities
+        x_label: Name of the signal axis (e.g., "Energy")
+        x_units: Units of the signal axis (e.g., "keV")
+        y_label: "Counts" for EDS_TEM signals, "Intensity" otherwise
+        zero_index: Index where energy = 0, None if outside the axis
+        fwhm_index: Index of the FWHM point after the zero peak, None if not found
+    """
+    model_config = ConfigDict(frozen=True)
+
+    x: list[float]
+    y: list[float]
+    x_label: Optional[str] = None
+    x_units: Optional[str] = None
+    y_label: str
+    zero_index: Optional[int] = None
+    fwhm_index: Optional[int] = None
+
+
+class AxesDataResponse(BaseModel):
+    """
+    Response model for /axes-data (first signal axis of a 3D signal).
+
+    Attributes:
+        name: Name of the axis
+        size: Number of channels
+        offset: Value of the first channel
+        scale: Step between channels
+        units: Units of the axis
+    """
+    model_config = ConfigDict(frozen=True)
+
+    name: Optional[str] = None
+    size: int
+    offset: float
+    scale: float
+    units: Optional[str] = None
+
+
+# Metadata is a nested tree whose keys depend on the file format
+MetadataResponse = dict[str, Any]
+
+
 
 
 
 
 # Track last call times to detect React StrictMode double-invocations
-last_calls = {}
+# Entries only matter for 100ms, so they expire after a second and the cache is
+# capped; unique filenames/regions no longer accumulate for the life of the process
+last_calls = TTLCache(maxsize=2048, ttl=1.0)
 
 def log_call(endpoint: str, params: dict = None) -> None:
-    """Helper to log endpoint calls and detect React StrictMode double-invocations"""
-    print("\n=== Starting log_call() in main.py ===")
+    """
+    Helper to log endpoint calls and detect React StrictMode double-invocations.
+    Only does anything when debug logging is enabled, so production requests
+    skip the bookkeeping entirely.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
     current_time = time.time()
-    call_key = f"{endpoint}:{str(params)}"
+    call_key = (endpoint, tuple(sorted(params.items())) if params else ())
     
-    if call_key in last_calls:
-        time_diff = current_time - last_calls[call_key]
+    last_time = last_calls.get(call_key)
+    if last_time is not None:
+        time_diff = current_time - last_time
         if time_diff < 0.1:  # If calls are within 100ms, likely StrictMode
-            print(f"\n[React StrictMode] Duplicate call to {endpoint}")
-            if params:
-                print(f"Parameters: {params}")
-            print(f"Time since last call: {time_diff*1000:.2f}ms")
+            logger.debug("[React StrictMode] Duplicate call to %s params=%s (%.2fms since last call)",
+                         endpoint, params, time_diff * 1000)
         else:
-            print(f"\n[New Request] {endpoint}")
-            if params:
-                print(f"Parameters: {params}")
+            logger.debug("[New Request] %s params=%s", endpoint, params)
     else:
-        print(f"\n[First Request] {endpoint}")
-        if params:
-            print(f"Parameters: {params}")
+        logger.debug("[First Request] %s params=%s", endpoint, params)
     
     last_calls[call_key] = current_time
-    print("=== Ending log_call() in main.py ===\n")
 
 
 
@@ -143,18 +496,18 @@ Lists all .emd files in the sample_data directory
 Returns: List of filenames
 Called by: Frontend getFiles() function
 """
-@app.get("/files")
+@api.get("/files")
 async def get_file_list():
-    print("\n=== Starting get_file_list() ===")
+    logger.debug("=== Starting get_file_list() ===")
     log_call("/files")
     try:
-        files = file_service.list_files()
-        print("=== Ending get_file_list() in main.py ===\n")
-        return JSONResponse(content=files)
+        files = await run_in_threadpool(file_service.list_files)
+        logger.debug("=== Ending get_file_list() in main.py ===")
+        return ORJSONResponse(content=files, headers=FILE_LIST_CACHE_HEADERS)
     except Exception as e:
-        print(f"ERROR in get_file_list(): {str(e)}")
-        print("=== Ending get_file_list() in main.py with error ===\n")
-        return JSONResponse(
+        logger.error("ERROR in get_file_list(): %s", e)
+        logger.debug("=== Ending get_file_list() in main.py with error ===")
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -166,20 +519,29 @@ Args:
 Returns:
     List of signals from the file
 """
-@app.get("/signals")
-async def get_signals(filename: str = Query(...)):
-    print("\n=== Starting get_signals() from main.py ===")
-    print(f"Filename: {filename}")
+@api.get("/signals")
+async def get_signals(request: Request, filename: str = Query(...)):
+    logger.debug("=== Starting get_signals() from main.py ===")
+    logger.debug("Filename: %s", filename)
     log_call("/signals", {"filename": filename})
     
     try:
-        signals = signal_service.get_signal_list(filename)
-        print("=== Ending get_signals() from main.py ===\n")
-        return JSONResponse(content={"signals": signals})  # Wrap signals in an object
+        st = await run_in_threadpool(response_cache.file_stat, filename)
+        etag = response_cache.etag_for(st)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        signals = await single_flight(
+            ("signals", filename), run_in_threadpool,
+            response_cache.cached_call, "signals", filename, None, st.st_mtime_ns,
+            signal_service.get_signal_list, filename
+        )
+        logger.debug("=== Ending get_signals() from main.py ===")
+        return ORJSONResponse(content={"signals": signals}, headers={"ETag": etag, **DATA_CACHE_HEADERS})  # Wrap signals in an object
     except Exception as e:
-        print(f"ERROR in get_signals(): {str(e)}")
-        print("=== Ending get_signals() from main.py with error ===\n")
-        return JSONResponse(
+        logger.error("ERROR in get_signals(): %s", e)
+        logger.debug("=== Ending get_signals() from main.py with error ===")
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -190,41 +552,59 @@ Gets image data from a specific signal in a file
 Args:
     filename: Name of the file (required)
     signal_idx: Index of the signal in the file (required)
+    format: "json" (default) or "binary" for the raw image array
 Returns: Dictionary containing image data and shape
 Called by: Frontend getImageData() function
 """
-@app.get("/image-data")
+@api.get("/image-data")
 async def get_image_data(
-    filename: str = Query(...),
-    signal_idx: int = Query(...)
+    ref: SignalRefDep,
+    request: Request,
+    response_format: ResponseFormat = Query("json", alias="format")
 ):
-    print("\n=== Starting get_image_data() from main.py ===")
-    print(f"Filename: {filename}, Signal Index: {signal_idx}")
-    log_call("/image-data", {"filename": filename, "signal_idx": signal_idx})
+    logger.debug("=== Starting get_image_data() from main.py ===")
+    logger.debug("Filename: %s, Signal Index: %s", ref.filename, ref.signal_idx)
+    log_call("/image-data", {"filename": ref.filename, "signal_idx": ref.signal_idx})
     try:
-        image_data = signal_service.get_image_data(filename, signal_idx)
+        binary = wants_binary(response_format, request)
+        st = await run_in_threadpool(response_cache.file_stat, ref.filename)
+        etag = response_cache.etag_for(st, ref.signal_idx, "binary" if binary else "json")
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, NEGOTIATED_CACHE_HEADERS)
+
+        image_data = await single_flight(
+            ("image-data", ref), run_in_threadpool,
+            signal_service.get_image_data, ref.filename, ref.signal_idx
+        )
         if image_data is None:
             raise ValueError("Failed to extract image data")
-        print("=== Ending get_image_data() successfully ===\n")
-        return JSONResponse(content=image_data)
+        logger.debug("=== Ending get_image_data() successfully ===")
+        headers = {"ETag": etag, **NEGOTIATED_CACHE_HEADERS}
+        if binary:
+            response = image_array_response(image_data)
+            response.headers.update(headers)
+            return response
+        return ORJSONResponse(content=image_data, headers=headers)
     except Exception as e:
-        print(f"ERROR in get_image_data(): {str(e)}")
-        print("=== Ending get_image_data() with error ===\n")
-        return JSONResponse(
+        logger.error("ERROR in get_image_data(): %s", e)
+        logger.debug("=== Ending get_image_data() with error ===")
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
 
-@app.get("/spectrum")
+@api.get("/spectrum", response_model=SpectrumResponse)
 async def get_spectrum(
-    filename: str = Query(...), 
-    signal_idx: int = Query(...)
+    ref: SignalRefDep,
+    request: Request,
+    response_format: ResponseFormat = Query("json", alias="format")
 ):
     """
     Gets spectrum data in the new format that includes both x and y values with units
     Args:
         filename: Name of the file (required)
         signal_idx: Index of the signal in the file (required)
+        format: "json" (default) or "binary" for a raw (2, N) array of x and y
     Returns: Dictionary containing:
         - x: array of energy values
         - y: array of intensity values
@@ -233,17 +613,24 @@ async def get_spectrum(
         - y_label: label for y-axis
     Called by: Frontend getNewSpectrum() function
     """
-    print("\n=== Starting get_spectrum() in main.py ===")
-    print(f"Filename: {filename}, Signal Index: {signal_idx}")
-    log_call("/spectrum", {"filename": filename, "signal_idx": signal_idx})
+    logger.debug("=== Starting get_spectrum() in main.py ===")
+    logger.debug("Filename: %s, Signal Index: %s", ref.filename, ref.signal_idx)
+    log_call("/spectrum", {"filename": ref.filename, "signal_idx": ref.signal_idx})
     try:
-        spectrum_data = signal_service.get_spectrum_data(filename, signal_idx)
-        print("=== Ending get_spectrum() in main.py ===\n")
-        return JSONResponse(content=spectrum_data)
+        spectrum_data = await single_flight(
+            ("spectrum", ref), run_in_threadpool,
+            signal_service.get_spectrum_data, ref.filename, ref.signal_idx
+        )
+        logger.debug("=== Ending get_spectrum() in main.py ===")
+        if wants_binary(response_format, request):
+            response = spectrum_array_response(spectrum_data)
+            response.headers.update(VARY_ACCEPT_HEADERS)
+            return response
+        return ORJSONResponse(content=spectrum_data, headers=VARY_ACCEPT_HEADERS)
     except Exception as e:
-        print(f"ERROR in get_spectrum() in main.py: {str(e)}")
-        print("=== Ending get_spectrum() with error in main.py ===\n")
-        return JSONResponse(
+        logger.error("ERROR in get_spectrum() in main.py: %s", e)
+        logger.debug("=== Ending get_spectrum() with error in main.py ===")
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -253,30 +640,48 @@ async def get_spectrum(
 Gets HAADF data from a specific signal in a file
 Args:
     filename: Name of the file (required)
+    format: "json" (default) or "binary" for the raw image array
 Returns: Dictionary containing HAADF data and shape
 Called by: Frontend getHAADFData() function
 """
-@app.get("/haadf-data")
+@api.get("/haadf-data")
 async def get_haadf_data(
-    filename: str = Query(...)
+    request: Request,
+    filename: str = Query(...),
+    response_format: ResponseFormat = Query("json", alias="format")
 ):
-    print("\n=== Starting get_haadf_data() from main.py ===")
-    print(f"Filename: {filename}")
+    logger.debug("=== Starting get_haadf_data() from main.py ===")
+    logger.debug("Filename: %s", filename)
     log_call("/haadf-data", {"filename": filename})
     try:
-        haadf_data = signal_service.get_haadf_data(filename)
+        binary = wants_binary(response_format, request)
+        st = await run_in_threadpool(response_cache.file_stat, filename)
+        etag = response_cache.etag_for(st, "haadf", "binary" if binary else "json")
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, NEGOTIATED_CACHE_HEADERS)
+
+        haadf_data = await single_flight(
+            ("haadf-data", filename), run_in_threadpool,
+            response_cache.cached_call, "haadf", filename, None, st.st_mtime_ns,
+            signal_service.get_haadf_data, filename
+        )
         if haadf_data is None:
-            print("=== Ending get_haadf_data() - No HAADF data found ===\n")
-            return JSONResponse(
+            logger.debug("=== Ending get_haadf_data() - No HAADF data found ===")
+            return ORJSONResponse(
                 status_code=404,
                 content={"error": "No HAADF data found in file"}
             )
-        print("=== Ending get_haadf_data() successfully ===\n")
-        return JSONResponse(content=haadf_data)
+        logger.debug("=== Ending get_haadf_data() successfully ===")
+        headers = {"ETag": etag, **NEGOTIATED_CACHE_HEADERS}
+        if binary:
+            response = image_array_response(haadf_data)
+            response.headers.update(headers)
+            return response
+        return ORJSONResponse(content=haadf_data, headers=headers)
     except Exception as e:
-        print(f"ERROR in get_haadf_data(): {str(e)}")
-        print("=== Ending get_haadf_data() with error ===\n")
-        return JSONResponse(
+        logger.error("ERROR in get_haadf_data(): %s", e)
+        logger.debug("=== Ending get_haadf_data() with error ===")
+        return ORJSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
@@ -290,19 +695,28 @@ Args:
 Returns: Dictionary containing metadata for the specific signal
 Called by: Frontend getMetadata() function
 """
-@app.get("/metadata")
-async def get_metadata(filename: str = Query(...), signal_idx: int = Query(...)):
+@api.get("/metadata", response_model=MetadataResponse)
+async def get_metadata(ref: SignalRefDep, request: Request):
     try:
-        print("\n=== Starting get_metadata() in main.py ===")
-        print(f"Requested metadata for file: {filename}, signal: {signal_idx}")
+        logger.debug("=== Starting get_metadata() in main.py ===")
+        logger.debug("Requested metadata for file: %s, signal: %s", ref.filename, ref.signal_idx)
+
+        st = await run_in_threadpool(response_cache.file_stat, ref.filename)
+        etag = response_cache.etag_for(st, ref.signal_idx)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
         
-        metadata = signal_service.get_metadata(filename, signal_idx)
-        print("=== Ending get_metadata() successfully ===\n")
-        return metadata
+        metadata = await single_flight(
+            ("metadata", ref), run_in_threadpool,
+            response_cache.cached_call, "metadata", ref.filename, ref.signal_idx, st.st_mtime_ns,
+            signal_service.get_metadata, ref.filename, ref.signal_idx
+        )
+        logger.debug("=== Ending get_metadata() successfully ===")
+        return ORJSONResponse(content=metadata, headers={"ETag": etag, **DATA_CACHE_HEADERS})
         
     except Exception as e:
-        print(f"ERROR in get_metadata(): {str(e)}")
-        print("=== Ending get_metadata() with error ===\n")
+        logger.error("ERROR in get_metadata(): %s", e)
+        logger.debug("=== Ending get_metadata() with error ===")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -314,37 +728,175 @@ Args:
 Returns: Dictionary containing axes data for the specific signal
 Called by: Frontend getAxesData() function
 """
-@app.get("/axes-data")
-async def get_axes_data(filename: str = Query(...), signal_idx: int = Query(...)):
+@api.get("/axes-data", response_model=Optional[AxesDataResponse])
+async def get_axes_data(ref: SignalRefDep):
     try:
-        print("\n=== Starting get_axes_data() in main.py ===")
-        print(f"Requested axes data for file: {filename}, signal: {signal_idx}")
+        logger.debug("=== Starting get_axes_data() in main.py ===")
+        logger.debug("Requested axes data for file: %s, signal: %s", ref.filename, ref.signal_idx)
         
-        axes_data = signal_service.get_axes_data(filename, signal_idx)
-        print("=== Ending get_axes_data() successfully ===\n")
-        return axes_data
+        axes_data = await single_flight(
+            ("axes-data", ref), run_in_threadpool,
+            signal_service.get_axes_data, ref.filename, ref.signal_idx
+        )
+        logger.debug("=== Ending get_axes_data() successfully ===")
+        return ORJSONResponse(content=axes_data)
         
     except Exception as e:
-        print(f"ERROR in get_axes_data(): {str(e)}")
-        print("=== Ending get_axes_data() with error ===\n")
+        logger.error("ERROR in get_axes_data(): %s", e)
+        logger.debug("=== Ending get_axes_data() with error ===")
         raise HTTPException(status_code=500, detail=str(e))
 
+"""
+Gets everything the viewers need for one signal in a single round-trip
+Args:
+    filename: Name of the file (required)
+    signal_idx: Index of the signal in the file (required)
+Returns: Dictionary containing:
+    - signals: signal list of the file (same as /signals)
+    - metadata: metadata of the signal (same as /metadata)
+    - axes: axes data of the signal (same as /axes-data)
+    - spectrum: spectrum data of the signal (same as /spectrum), or None if
+      the signal can't be displayed as a spectrum
+Called by: Frontend getBundle() function
+"""
+@api.get("/bundle")
+async def get_bundle(ref: SignalRefDep):
+    logger.debug("=== Starting get_bundle() in main.py ===")
+    log_call("/bundle", {"filename": ref.filename, "signal_idx": ref.signal_idx})
+    try:
+        # Load (or fetch from cache) all signals of the file once,
+        # the four calls below then all hit the cache
+        await run_in_threadpool(file_service.get_or_load_file, ref.filename)
+        st = await run_in_threadpool(response_cache.file_stat, ref.filename)
+
+        # Same single_flight keys and response cache entries as the standalone
+        # endpoints, so a bundle and e.g. a /metadata request share the work
+        signals, metadata, axes, spectrum = await asyncio.gather(
+            single_flight(
+                ("signals", ref.filename), run_in_threadpool,
+                response_cache.cached_call, "signals", ref.filename, None, st.st_mtime_ns,
+                signal_service.get_signal_list, ref.filename
+            ),
+            single_flight(
+                ("metadata", ref), run_in_threadpool,
+                response_cache.cached_call, "metadata", ref.filename, ref.signal_idx, st.st_mtime_ns,
+                signal_service.get_metadata, ref.filename, ref.signal_idx
+            ),
+            single_flight(
+                ("axes-data", ref), run_in_threadpool,
+                signal_service.get_axes_data, ref.filename, ref.signal_idx
+            ),
+            single_flight(
+                ("spectrum", ref), run_in_threadpool,
+                signal_service.get_spectrum_data, ref.filename, ref.signal_idx
+            ),
+            return_exceptions=True
+        )
+        if isinstance(signals, Exception):
+            raise signals
+
+        logger.debug("=== Ending get_bundle() successfully ===")
+        return ORJSONResponse(content={
+            "signals": signals,
+            "metadata": None if isinstance(metadata, Exception) else metadata,
+            "axes": None if isinstance(axes, Exception) else axes,
+            "spectrum": None if isinstance(spectrum, Exception) else spectrum
+        })
+    except Exception as e:
+        logger.error("ERROR in get_bundle(): %s", e)
+        logger.debug("=== Ending get_bundle() with error ===")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Upper bound on sub-requests per /batch call
+MAX_BATCH_REQUESTS = 50
+
+# Headers of every sub-request. The sub-responses never leave the process, so
+# asking for identity stops GZipMiddleware compressing bodies httpx would
+# decompress right away; JSON keeps octet-stream bodies out of the batch.
+BATCH_SUB_REQUEST_HEADERS = {"accept-encoding": "identity", "accept": "application/json"}
+
+
+class SubRequest(BaseModel):
+    """
+    One request inside a /batch call.
+
+    Attributes:
+        id: Client-chosen identifier, echoed back with the response
+        url: Path and query of a GET endpoint, e.g. "/api/metadata?filename=a.emd&signal_idx=0"
+        method: Only "GET" is supported
+    """
+    id: str
+    url: str
+    method: Literal["GET"] = "GET"
+
+
+class BatchRequest(BaseModel):
+    """Request model for /batch"""
+    requests: list[SubRequest]
+
+
+"""
+Runs several GET requests in one round-trip
+Sub-requests are dispatched in parallel straight into this app (ASGI transport,
+no network socket) and go through the same endpoints, caches and error handling
+as individual requests.
+Args:
+    requests: List of {id, url, method} sub-requests
+Returns: Dictionary containing:
+    - responses: list of {id, status, body} in the order of the sub-requests
+Called by: Frontend batchRequests() function
+"""
+@api.post("/batch")
+async def batch(request: BatchRequest):
+    logger.debug("=== Starting batch() in main.py ===")
+    if len(request.requests) > MAX_BATCH_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_REQUESTS} requests per batch")
+    for sub_request in request.requests:
+        if not sub_request.url.startswith("/api/") or sub_request.url.startswith("/api/batch"):
+            raise HTTPException(status_code=400, detail=f"Unsupported batch url: {sub_request.url}")
+        # Binary bodies can't be embedded in the JSON response
+        if "binary" in parse_qs(urlsplit(sub_request.url).query).get("format", []):
+            raise HTTPException(status_code=400, detail=f"Binary format is not supported in batch: {sub_request.url}")
+
+    # Unknown /api/ paths would otherwise fall through to the SPA mount and
+    # come back as index.html with status 200
+    get_paths = {route.path for route in api.routes if "GET" in getattr(route, "methods", ())}
+
+    async def dispatch(client, sub_request):
+        if urlsplit(sub_request.url).path not in get_paths:
+            return {"id": sub_request.id, "status": 404, "body": {"detail": "Not Found"}}
+        response = await client.get(sub_request.url)
+        if response.headers.get("content-type", "").startswith("application/json"):
+            body = response.json()
+        else:
+            body = response.text
+        return {"id": sub_request.id, "status": response.status_code, "body": body}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch",
+                                 headers=BATCH_SUB_REQUEST_HEADERS) as client:
+        responses = await asyncio.gather(*[dispatch(client, r) for r in request.requests])
+
+    logger.debug("=== Ending batch() successfully ===")
+    return ORJSONResponse(content={"responses": responses})
+
+
 ################################################################################
 #################### API Endpoints for Emission Line Analysis ##################
 ################################################################################
-@app.get("/zero-peak-width")
-async def get_zero_peak_width(filename: str = Query(...), signal_idx: int = Query(...)):
+@api.get("/zero-peak-width")
+async def get_zero_peak_width(ref: SignalRefDep):
     try:
-        print(f"\n=== Starting get_zero_peak_width() in main.py ===")
-        print(f"Requested zero peak width for file: {filename}, signal: {signal_idx}")
+        logger.debug("=== Starting get_zero_peak_width() in main.py ===")
+        logger.debug("Requested zero peak width for file: %s, signal: %s", ref.filename, ref.signal_idx)
         
-        zero_peak_width = data_service.get_zero_peak_width(filename, signal_idx)
-        print("=== Ending get_zero_peak_width() successfully ===\n")
+        zero_peak_width = await run_in_threadpool(data_service.get_zero_peak_width, ref.filename, ref.signal_idx)
+        logger.debug("=== Ending get_zero_peak_width() successfully ===")
         return zero_peak_width
     
     except Exception as e:
-        print(f"ERROR in get_zero_peak_width(): {str(e)}")
-        print("=== Ending get_zero_peak_width() with error ===\n")
+        logger.error("ERROR in get_zero_peak_width(): %s", e)
+        logger.debug("=== Ending get_zero_peak_width() with error ===")
         raise HTTPException(status_code=500, detail=str(e))
 
 ################################################################################
@@ -352,19 +904,19 @@ async def get_zero_peak_width(filename: str = Query(...), signal_idx: int = Quer
 ################################################################################
 
 
-@app.get("/emission-spectra")
+@api.get("/emission-spectra")
 async def get_emission_spectra(atomic_number: int):
     try:
-        print(f"\n=== Starting get_emission_spectra() in main.py ===")
-        print(f"Requested emission spectra for atomic number: {atomic_number}")
+        logger.debug("=== Starting get_emission_spectra() in main.py ===")
+        logger.debug("Requested emission spectra for atomic number: %s", atomic_number)
         
-        spectra = data_service.get_emission_spectra(atomic_number)
+        spectra = await run_in_threadpool(data_service.get_emission_spectra, atomic_number)
 
         return spectra
     
     except Exception as e:
-        print(f"ERROR in get_emission_spectra() in main.py: {str(e)}")
-        print("=== Ending get_emission_spectra() with error in main.py ===\n")
+        logger.error("ERROR in get_emission_spectra() in main.py: %s", e)
+        logger.debug("=== Ending get_emission_spectra() with error in main.py ===")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -377,22 +929,39 @@ Gets the spectrum data for a specific region of the image
 Args:
     filename: Name of the file (required)
     signal_idx: Index of the signal in the file (required)
+    format: "json" (default) or "binary" for a raw (2, N) array of x and y
 """
-@app.get("/region-spectrum")
-async def get_region_spectrum(filename: str, signal_idx: int, x1: int, y1: int, x2: int, y2: int):
+@api.get("/region-spectrum")
+async def get_region_spectrum(
+    ref: SignalRefDep,
+    region: RegionDep,
+    request: Request,
+    response_format: ResponseFormat = Query("json", alias="format")
+):
     try:
-        print(f"\n=== Starting get_region_spectrum() in main.py ===")
-        print(f"Requested region spectrum for file: {filename}, signal: {signal_idx}")
-        print(f"Region: ({x1}, {y1}) to ({x2}, {y2})")
+        logger.debug("=== Starting get_region_spectrum() in main.py ===")
+        logger.debug("Requested region spectrum for file: %s, signal: %s", ref.filename, ref.signal_idx)
+        logger.debug("Region: %s", region)
         
-        region = {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
-        data = signal_service.get_spectrum_from_2d_range(filename, signal_idx, region)
-        print("=== Ending get_region_spectrum() successfully ===\n")
-        return data
+        data = await single_flight(
+            ("region-spectrum", ref, region), region_batcher.submit,
+            ref.filename, ref.signal_idx, asdict(region)
+        )
+        logger.debug("=== Ending get_region_spectrum() successfully ===")
+        if wants_binary(response_format, request):
+            response = spectrum_array_response(data)
+            response.headers.update(VARY_ACCEPT_HEADERS)
+            return response
+        return ORJSONResponse(content=data, headers=VARY_ACCEPT_HEADERS)
         
+    except ValueError as e:
+        # Bad region for this signal (e.g. entirely outside the image), like
+        # region_query's empty-region check
+        logger.debug("Rejected region in get_region_spectrum(): %s", e)
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
-        print(f"ERROR in get_region_spectrum(): {str(e)}")
-        print("=== Ending get_region_spectrum() with error ===\n")
+        logger.error("ERROR in get_region_spectrum(): %s", e)
+        logger.debug("=== Ending get_region_spectrum() with error ===")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -404,20 +973,29 @@ Parameters:
 - signal_idx: Index of the signal in the file
 - start: Starting energy channel index
 - end: Ending energy channel index
+- format: "json" (default) or "binary" for the raw 2D array
 
 Returns:
 - Array of spectrum data points for the selected energy range
 """
-@app.get("/energy-range-spectrum")
+@api.get("/energy-range-spectrum")
 async def energy_range_spectrum(
-    filename: str = Query(..., description="Name of the file to process"),
-    signal_idx: int = Query(..., description="Index of the signal in the file"),
+    ref: SignalRefDep,
+    request: Request,
     start: int = Query(..., description="Start index of the energy range"),
-    end: int = Query(..., description="End index of the energy range")
+    end: int = Query(..., description="End index of the energy range"),
+    response_format: ResponseFormat = Query("json", alias="format", description="json or binary")
 ):
 
     try:
-        return await signal_service.spectrum_to_2d(filename, signal_idx, start, end)
+        summed_image = await run_in_process_pool(
+            compute_workers.compute_energy_range_image, ref.filename, ref.signal_idx, start, end
+        )
+        if wants_binary(response_format, request):
+            response = array_response(summed_image)
+            response.headers.update(VARY_ACCEPT_HEADERS)
+            return response
+        return ORJSONResponse(content=summed_image, headers=VARY_ACCEPT_HEADERS)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -434,10 +1012,9 @@ Parameters:
 Returns:
 - Total sum of x-ray counts within the specified energy range
 """
-@app.get("/emission-spectra-width-sum")
+@api.get("/emission-spectra-width-sum")
 async def emission_spectra_width_sum(
-    filename: str = Query(..., description="Name of the file to process"),
-    signal_idx: int = Query(..., description="Index of the signal in the file"),
+    ref: SignalRefDep,
     start: float = Query(..., description="Start energy value in keV"),
     end: float = Query(..., description="End energy value in keV")
 ):
@@ -454,7 +1031,9 @@ async def emission_spectra_width_sum(
     - Total sum of x-ray counts within the specified energy range
     """
     try:
-        return await signal_service.get_emission_spectra_width_sum(filename, signal_idx, start, end)
+        return await run_in_process_pool(
+            compute_workers.compute_emission_spectra_width_sum, ref.filename, ref.signal_idx, start, end
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -497,7 +1076,7 @@ class ORCIDTokenResponse(BaseModel):
     name: str = None
     expires_in: int = None
 
-@app.get("/api/auth/orcid/login-url")
+@api.get("/auth/orcid/login-url")
 async def get_orcid_login_url():
     """
     Get the ORCID authorization URL for user authentication.
@@ -512,22 +1091,22 @@ async def get_orcid_login_url():
     Raises:
         HTTPException: If ORCID service configuration is invalid
     """
-    print("\n=== BACKEND: /api/auth/orcid/login-url endpoint called ===")
-    print(f"ORCID service object: {orcid_service}")
-    print(f"ORCID service configured: {getattr(orcid_service, 'is_configured', 'UNKNOWN')}")
+    logger.debug("=== BACKEND: /api/auth/orcid/login-url endpoint called ===")
+    logger.debug("ORCID service object: %s", orcid_service)
+    logger.debug("ORCID service configured: %s", getattr(orcid_service, 'is_configured', 'UNKNOWN'))
     try:
-        print("Calling orcid_service.get_authorization_url()...")
+        logger.debug("Calling orcid_service.get_authorization_url()...")
         authorization_url = orcid_service.get_authorization_url()
-        print(f"Successfully generated authorization URL (length: {len(authorization_url)})")
+        logger.debug("Successfully generated authorization URL (length: %s)", len(authorization_url))
         return {"authorization_url": authorization_url}
     except ValueError as e:
-        print(f"ValueError in get_orcid_login_url: {str(e)}")
+        logger.error("ValueError in get_orcid_login_url: %s", e)
         raise HTTPException(status_code=500, detail=f"ORCID configuration error: {str(e)}")
     except Exception as e:
-        print(f"Unexpected error in get_orcid_login_url: {str(e)}")
+        logger.error("Unexpected error in get_orcid_login_url: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to generate ORCID login URL: {str(e)}")
 
-@app.post("/api/auth/orcid/exchange", response_model=ORCIDTokenResponse)
+@api.post("/auth/orcid/exchange", response_model=ORCIDTokenResponse)
 async def exchange_orcid_code(request: ORCIDCodeRequest):
     """
     Exchange an ORCID authorization code for an access token.
@@ -546,18 +1125,18 @@ async def exchange_orcid_code(request: ORCIDCodeRequest):
     Raises:
         HTTPException: If the code exchange fails or ORCID returns an error
     """
-    print("\n=== BACKEND: /api/auth/orcid/exchange endpoint called ===")
-    print(f"Authorization code received (first 20 chars): {request.code[:20]}...")
-    print(f"ORCID service object: {orcid_service}")
-    print(f"ORCID service configured: {getattr(orcid_service, 'is_configured', 'UNKNOWN')}")
+    logger.debug("=== BACKEND: /api/auth/orcid/exchange endpoint called ===")
+    logger.debug("Authorization code received (first 20 chars): %s...", request.code[:20])
+    logger.debug("ORCID service object: %s", orcid_service)
+    logger.debug("ORCID service configured: %s", getattr(orcid_service, 'is_configured', 'UNKNOWN'))
     try:
-        print("Calling orcid_service.exchange_code_for_token()...")
+        logger.debug("Calling orcid_service.exchange_code_for_token()...")
         # Exchange the authorization code for a token using the ORCID service
         token_data = await orcid_service.exchange_code_for_token(request.code)
         
-        print("Token exchange successful! Creating response...")
-        print(f"Received ORCID iD: {token_data['orcid_id']}")
-        print(f"User name: {token_data.get('name', 'Not provided')}")
+        logger.debug("Token exchange successful! Creating response...")
+        logger.debug("Received ORCID iD: %s", token_data['orcid_id'])
+        logger.debug("User name: %s", token_data.get('name', 'Not provided'))
         
         # Return the authentication data to the frontend
         response = ORCIDTokenResponse(
@@ -566,41 +1145,31 @@ async def exchange_orcid_code(request: ORCIDCodeRequest):
             name=token_data.get("name"),
             expires_in=token_data.get("expires_in")
         )
-        print("Returning successful response to frontend")
+        logger.debug("Returning successful response to frontend")
         return response
     
     except ValueError as e:
-        print(f"ValueError in exchange_orcid_code: {str(e)}")
+        logger.error("ValueError in exchange_orcid_code: %s", e)
         raise HTTPException(status_code=400, detail=f"Invalid authorization code: {str(e)}")
     except Exception as e:
-        print(f"Unexpected error in exchange_orcid_code: {str(e)}")
+        logger.error("Unexpected error in exchange_orcid_code: %s", e)
         raise HTTPException(status_code=500, detail=f"Token exchange failed: {str(e)}")
 
 
+# Register all API endpoints defined above under /api
+app.include_router(api)
+
+
 ################################################################################
-#################### Catch-all route to serve React app ########################
+#################### Static mount to serve React app ###########################
 ################!!!!  MUST BE LAST ROUTE DEFINED IN FASTAPI !!!!!###############
 ################!!!!       MUST BE AT BOTTOM OF FILE        !!!!!###############
 ################################################################################
 
 
-# Catch-all route to serve React app for any non-API routes
-# This MUST be the last route defined in FastAPI
-# It enables React Router to handle client-side routing properly
-@app.get("/{path:path}")
-async def serve_react_app(path: str):
-    """
-    Serves the React application for any route that doesn't match API endpoints.
-    This allows React Router to handle client-side routing properly.
-    
-    Args:
-        path: The requested path (automatically captured by FastAPI)
-    
-    Returns:
-        The React app's index.html file for all non-API routes
-    """
-    from fastapi.responses import FileResponse
-    
-    # Always return the React app's main HTML file
-    # React Router will handle the client-side routing
-    return FileResponse("static/index.html")
\ No newline at end of file
+# Serves the React build (index.html, /assets/..., favicons) for any request
+# that doesn't match an API endpoint. Files are sent straight from Starlette's
+# static file handler, with no Python endpoint in between.
+# This MUST be mounted after all routes are defined
+# Unknown paths fall back to index.html so React Router can handle client-side routing
+app.mount("/", SPAStaticFiles(directory="static", html=True), name="spa")
@@ -1,7 +1,16 @@
-from utils.constants import DATA_DIR, CURRENT_FILE
 import os
 import logging
+import functools
 import numpy as np
+from dataclasses import dataclass
+
+# Numba is installed with HyperSpy; the FWHM search falls back to NumPy without it
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -10,133 +19,203 @@ def load_metadata(signal):
     Loads only the metadata categories from a microscopy file.
 
     Args:
-        filename: Name of the file to load metadata from, used to check CURRENT_FILE
-        index: Index of the signal to load metadata from, used to index into CURRENT_FILE["signals"]
+        signal: The hyperspy signal object to load metadata from
         
     Returns:
         dict: Dictionary containing metadata categories and their values
     """
-    print(f"\n=== Starting load_metadata() in data_functions.py ===")
+    logger.debug("Starting load_metadata()")
     try:
         
         metadata_dict = {}
         
         # Access metadata categories
-        if hasattr(sig, 'metadata'):
-            print("\nExtracting metadata categories...")
+        if hasattr(signal, 'metadata'):
+            logger.debug("Extracting metadata categories")
             
-            # Get all top-level metadata categories
-            for category in sig.metadata.as_dictionary().keys():
-                category_data = getattr(sig.metadata, category, None)
+            # The top-level categories are read from the tree browser directly;
+            # as_dictionary() deep-copies, so it only runs on each category's
+            # own sub-tree rather than on the whole metadata tree
+            metadata = signal.metadata
+            for category in metadata.keys():
+                category_data = getattr(metadata, category)
+                if hasattr(category_data, 'as_dictionary'):
+                    category_data = category_data.as_dictionary()
                 if category_data is not None:
-                    try:
-                        metadata_dict[category] = category_data.as_dictionary()
-                        print(f"Found category: {category}")
-                    except Exception as e:
-                        print(f"Error extracting {category}: {str(e)}")
-                        metadata_dict[category] = str(category_data)
+                    metadata_dict[category] = category_data
         
-        print("\nMetadata categories found:", list(metadata_dict.keys()))
-        print("=== Ending load_metadata() successfully ===\n")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Metadata categories found: %s", list(metadata_dict.keys()))
         return metadata_dict
         
-    except Exception as e:
-        print(f"\n!!! Error loading metadata for {filename} !!!")
-        print(f"Error type: {type(e)}")
-        print(f"Error message: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        print("=== Ending load_metadata() with error ===\n")
+    except Exception:
+        logger.exception("load_metadata failed")
         raise
 
+def _identity(value):
+    return value
+
+
+# NumPy dtype kinds (bool, int, uint, float) that orjson serializes natively
+_ORJSON_NUMPY_KINDS = frozenset("biuf")
+
+
+def _convert_ndarray(value):
+    """
+    Numeric, C-contiguous, native-endian arrays are left as arrays: the metadata
+    endpoints return an ORJSONResponse, which serializes them in C without building
+    a Python list first. Other arrays (strings, objects, views, and byte-swapped
+    arrays, which orjson would read as native order) go through tolist().
+    """
+    if (value.dtype.kind in _ORJSON_NUMPY_KINDS and value.dtype.isnative
+            and value.flags.c_contiguous):
+        return value
+    return value.tolist()
+
+
+def _convert_metadata_value(value):
+    """
+    Converts a single metadata value to a value orjson can serialize.
+    Exact types are looked up in _METADATA_CONVERTERS. On a miss the value is
+    matched with isinstance, so subclasses (OrderedDict, DictionaryTreeBrowser,
+    masked arrays...) are handled like their base types: numeric NumPy scalars
+    are kept as-is (orjson handles them), other NumPy scalars and array
+    subclasses are converted with tolist(), and anything else falls back to its
+    string representation.
+    """
+    converter = _METADATA_CONVERTERS.get(type(value))
+    if converter is not None:
+        return converter(value)
+    if isinstance(value, np.generic):
+        if value.dtype.kind in _ORJSON_NUMPY_KINDS and value.dtype.isnative:
+            return value
+        return value.tolist()
+    if isinstance(value, dict) or hasattr(value, 'as_dictionary'):
+        return _convert_metadata_to_serializable(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (str, int, float, bool, list)):
+        return value
+    return str(value)
+
+
 def _convert_metadata_to_serializable(metadata_dict):
-        """
-        Converts metadata dictionary to a JSON-serializable format.
-        Args:
-            metadata_dict (dict): Dictionary containing metadata
-        Returns:
-            dict: JSON-serializable dictionary
-        """
-        result = {}
-        
-        # If it's a DictionaryBrowser, convert to dict
-        if hasattr(metadata_dict, 'as_dictionary'):
-            metadata_dict = metadata_dict.as_dictionary()
-            
-        for key, value in metadata_dict.items():
-            # Skip private keys
-            if key.startswith('_'):
-                continue
-                
-            try:
-                # Handle nested dictionaries
-                if hasattr(value, 'as_dictionary') or isinstance(value, dict):
-                    result[key] = self._convert_metadata_to_serializable(value)
-                # Handle numpy arrays
-                elif hasattr(value, 'tolist'):
-                    result[key] = value.tolist()
-                # Handle basic types
-                elif isinstance(value, (str, int, float, bool, list)):
-                    result[key] = value
-                # Convert other types to string representation
-                else:
-                    result[key] = str(value)
-            except Exception as e:
-                print(f"Warning: Could not convert metadata key {key}: {str(e)}")
-                result[key] = str(value)
-                
-        return result
+    """
+    Converts metadata dictionary to a JSON-serializable format.
+    The result is meant for ORJSONResponse (OPT_SERIALIZE_NUMPY), so numeric
+    NumPy arrays and scalars are not converted to Python objects.
+    Args:
+        metadata_dict (dict or DictionaryTreeBrowser): Dictionary containing metadata
+    Returns:
+        dict: JSON-serializable dictionary
+    """
+    # If it's a DictionaryTreeBrowser, convert to dict
+    # as_dictionary() deep-copies the whole tree including all nested nodes,
+    # so it only runs once at the top; the recursion below sees plain dicts
+    if not isinstance(metadata_dict, dict):
+        metadata_dict = metadata_dict.as_dictionary()
+
+    result = {}
+    for key, value in metadata_dict.items():
+        # Skip private keys
+        if key.startswith('_'):
+            continue
+
+        try:
+            result[key] = _convert_metadata_value(value)
+        except Exception as e:
+            logger.warning("Could not convert metadata key %s: %s", key, e)
+            result[key] = str(value)
+
+    return result
+
+
+# Converters keyed on the exact type of a metadata value (see _convert_metadata_value).
+# A dict lookup per value covers the common types; subclasses miss the lookup
+# and go through the isinstance() checks in _convert_metadata_value.
+_METADATA_CONVERTERS = {
+    dict: _convert_metadata_to_serializable,
+    np.ndarray: _convert_ndarray,
+    list: _identity,
+    str: _identity,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+}
+
+# Attributes on the signal object holding per-signal axis information
+# (see load_axes_manager and get_zero_index). Like the summed spectrum, they
+# live exactly as long as the cached signal.
+_AXES_INFO_ATTR = "_crucible_axes_info"
+_ZERO_INDEX_ATTR = "_crucible_zero_index"
+
+
+@dataclass(frozen=True, slots=True)
+class AxesInfo:
+    """
+    Calibration of a signal's first signal axis (see load_axes_manager).
+    Read through attributes in the services; converted with dataclasses.asdict()
+    where it is returned to the frontend.
+    """
+    name: str
+    size: int
+    offset: float
+    scale: float
+    units: str
+
 
 def load_axes_manager(signal):
     """
     Loads axes manager information from a signal in a microscopy file.
+    The result is stored on the signal, so the axes manager is only walked once.
 
     Args:
-        filename: Name of the file to load axes manager from
-        index: Index of the signal to load axes manager from (defaults to 0)
+        signal: HyperSpy signal to read the axes manager from
         
     Returns:
-        dict: Dictionary containing axes manager information including:
+        AxesInfo: Axes manager information of the first signal axis:
+            - name: The name of the first axis
+            - size: The number of channels of the first axis
             - offset: The offset value of the first axis
             - scale: The scale value of the first axis
             - units: The units of the first axis
     """
-    print(f"\n=== Starting load_axes_manager() in data_functions.py ===")
+    # AxesInfo is immutable, so the stored instance is returned directly
+    cached = getattr(signal, _AXES_INFO_ATTR, None)
+    if cached is not None:
+        return cached
+
+    logger.debug("Starting load_axes_manager()")
     try:
         
         
-        axes_info = {}
-        
         # Access axes manager information
         if hasattr(signal, 'axes_manager'):
-            print("\nExtracting axes manager information...")
+            logger.debug("Extracting axes manager information")
             try:
                 first_axis = signal.axes_manager.signal_axes[0]
-                axes_info = {
-                    'name': first_axis.name,
-                    'size': first_axis.size,
-                    'offset': first_axis.offset,
-                    'scale': first_axis.scale,
-                    'units': first_axis.units
-                }
-                print(f"Found axes information: {axes_info}")
+                axes_info = AxesInfo(
+                    name=first_axis.name,
+                    size=first_axis.size,
+                    offset=first_axis.offset,
+                    scale=first_axis.scale,
+                    units=first_axis.units
+                )
+                logger.debug("Found axes information: %s", axes_info)
             except Exception as e:
-                print(f"Error extracting axes information: {str(e)}")
+                logger.debug("Error extracting axes information: %s", e)
                 raise
         else:
-            print("No axes manager found or axes manager is empty")
+            logger.debug("No axes manager found or axes manager is empty")
             return None
         
-        print("=== Ending load_axes_manager() successfully ===\n")
+        setattr(signal, _AXES_INFO_ATTR, axes_info)
         return axes_info
         
-    except Exception as e:
-        print(f"\n!!! Error loading axes manager for {signal.metadata.General.title} !!!")
-        print(f"Error type: {type(e)}")
-        print(f"Error message: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        print("=== Ending load_axes_manager() with error ===\n")
+    except Exception:
+        # getattr so a signal without a title doesn't raise a second error here
+        logger.exception("load_axes_manager failed for %s",
+                         getattr(signal.metadata.General, 'title', '<unknown>'))
         raise
 
 # def load_spectrum_axes(signal):
@@ -217,6 +296,211 @@ def load_axes_manager(signal):
 #     """
 #     return signal.sum().data.tolist()
 
+@functools.lru_cache(maxsize=64)
+def energy_axis(offset, scale, size):
+    """
+    Builds the calibrated values of a uniform axis in one vectorized pass.
+    Real Value = (Index * Scale) + Offset
+
+    Results are cached per (offset, scale, size), so repeated spectrum requests
+    for the same file reuse the same array. The array is returned read-only
+    because it is shared between callers.
+
+    Args:
+        offset (float): Value of the first channel
+        scale (float): Step between channels
+        size (int): Number of channels
+
+    Returns:
+        numpy.ndarray: float64 array of axis values
+    """
+    values = index_to_energy(np.arange(size, dtype=np.float64), offset, scale)
+    values.setflags(write=False)
+    return values
+
+
+def energy_to_index(energy, offset, scale):
+    """
+    Converts calibrated axis values back to (fractional) channel indices.
+    Index = (Real - Offset) / Scale
+
+    Args:
+        energy (float or array-like): Axis value(s), e.g. in keV
+        offset (float): Value of the first channel
+        scale (float): Step between channels
+
+    Returns:
+        numpy.ndarray: float64 array of channel indices
+    """
+    inv_scale = 1.0 / scale
+    return (np.asarray(energy, dtype=np.float64) - offset) * inv_scale
+
+
+def index_to_energy(index, offset, scale):
+    """
+    Converts (fractional) channel indices to calibrated axis values.
+    Real = (Index * Scale) + Offset
+
+    Accepts a single index or any array of indices, so many indices (e.g. the
+    bounds of a set of regions) are converted in one NumPy operation.
+
+    Args:
+        index (int, float or array-like): Channel index or indices
+        offset (float): Value of the first channel
+        scale (float): Step between channels
+
+    Returns:
+        numpy.ndarray: float64 array of axis values, e.g. in keV
+    """
+    return np.asarray(index, dtype=np.float64) * scale + offset
+
+
+def get_axis_values(axis):
+    """
+    Returns the calibrated values of a HyperSpy axis.
+    Uniform axes (the usual case for EDS) go through the cached energy_axis(),
+    non-uniform axes fall back to the values HyperSpy stores.
+
+    Args:
+        axis: HyperSpy DataAxis, e.g. signal.axes_manager.signal_axes[0]
+
+    Returns:
+        numpy.ndarray: float64 array of axis values
+    """
+    if getattr(axis, 'is_uniform', True) and hasattr(axis, 'scale'):
+        return energy_axis(float(axis.offset), float(axis.scale), int(axis.size))
+    return np.asarray(axis.axis, dtype=np.float64)
+
+
+def compute_array(data):
+    """
+    Returns signal data as a NumPy array.
+    Files are loaded lazily, so signal.data (and any slice or reduction of it)
+    is usually a Dask array; it is computed here on the threaded scheduler,
+    reading only the chunks the expression needs. NumPy input is returned as-is.
+
+    Args:
+        data: NumPy or Dask array
+
+    Returns:
+        numpy.ndarray: The computed data
+    """
+    if hasattr(data, 'compute'):
+        data = data.compute(scheduler='threads')
+    return np.asarray(data)
+
+
+def _accumulate_dtype(dtype):
+    """Float data is summed in float64; integer counts are summed exactly in 64 bit"""
+    if dtype.kind == 'f':
+        return np.float64
+    return np.uint64 if dtype.kind == 'u' else np.int64
+
+
+def sum_region(data, y1, y2, x1, x2):
+    """
+    Sums the spectra of a rectangular region of a (height, width, channels) datacube.
+    Bounds follow slice rules: rows y1..y2-1 and columns x1..x2-1.
+
+    Lazily loaded data is sliced and reduced by Dask, which reads only the
+    chunks under the region.
+
+    Args:
+        data: 3D NumPy or Dask array
+        y1, y2 (int): Row range
+        x1, x2 (int): Column range
+
+    Returns:
+        numpy.ndarray: 1D array of summed intensities (float64, or 64-bit integers for counts)
+    """
+    accumulate_dtype = _accumulate_dtype(data.dtype)
+    return compute_array(data[y1:y2, x1:x2, :].sum(axis=(0, 1), dtype=accumulate_dtype))
+
+
+def sum_regions(data, bounds):
+    """
+    Sums the spectra of several rectangular regions of the same datacube in one call.
+
+    For lazily loaded data every region's reduction is computed in a single Dask
+    pass, so a chunk under several regions (e.g. overlapping regions being
+    compared) is read from disk once instead of once per region. In-memory
+    arrays are summed region by region.
+
+    Args:
+        data: 3D NumPy or Dask array
+        bounds (list): (y1, y2, x1, x2) tuples with the same slice rules as sum_region
+
+    Returns:
+        list: 1D numpy.ndarray of summed intensities per region, in the order of bounds
+    """
+    if hasattr(data, 'compute'):
+        from dask import compute as dask_compute
+        accumulate_dtype = _accumulate_dtype(data.dtype)
+        sums = [data[y1:y2, x1:x2, :].sum(axis=(0, 1), dtype=accumulate_dtype)
+                for y1, y2, x1, x2 in bounds]
+        return [np.asarray(summed) for summed in dask_compute(*sums, scheduler='threads')]
+    return [sum_region(data, y1, y2, x1, x2) for y1, y2, x1, x2 in bounds]
+
+
+# Attribute on the signal object holding its summed spectrum (see get_summed_spectrum)
+_SUMMED_SPECTRUM_ATTR = "_crucible_summed_spectrum"
+
+
+def get_summed_spectrum(signal):
+    """
+    Returns the signal summed over all navigation dimensions, computing it only once.
+
+    signal.sum() is a full reduction over the datacube, and the spectrum, zero peak
+    and FWHM code all need it. The result is stored on the signal object itself, so
+    it lives exactly as long as the cached signal and is dropped with it when the
+    file leaves the cache. Signals are never modified after loading, so the stored
+    sum can't go stale. It is returned read-only because it is shared.
+    Lazy signals are summed chunk by chunk and the result is still an ndarray.
+
+    Args:
+        signal: The hyperspy signal object
+
+    Returns:
+        numpy.ndarray: 1D array of summed intensities
+    """
+    summed = getattr(signal, _SUMMED_SPECTRUM_ATTR, None)
+    if summed is None:
+        # Lazy signals reduce chunk by chunk, so the cube is streamed from
+        # disk instead of being loaded whole
+        summed = compute_array(signal.sum().data)
+        summed.setflags(write=False)
+        setattr(signal, _SUMMED_SPECTRUM_ATTR, summed)
+    return summed
+
+
+# Attribute on the signal object holding its summed image (see get_summed_image)
+_SUMMED_IMAGE_ATTR = "_crucible_summed_image"
+
+
+def get_summed_image(signal):
+    """
+    Returns a 3D signal summed over its spectrum axis (the 2D image the viewer
+    shows), computing it only once.
+
+    Like get_summed_spectrum, the projection is a reduction over the whole cube,
+    which for a lazily loaded file means reading it from disk. It is stored on the
+    signal object and returned read-only because it is shared.
+
+    Args:
+        signal: The hyperspy signal object with 3D data
+
+    Returns:
+        numpy.ndarray: 2D array of summed intensities
+    """
+    summed = getattr(signal, _SUMMED_IMAGE_ATTR, None)
+    if summed is None:
+        # Only the projection is materialized; a lazy cube is summed chunk by chunk
+        summed = compute_array(signal.data.sum(axis=2))
+        summed.setflags(write=False)
+        setattr(signal, _SUMMED_IMAGE_ATTR, summed)
+    return summed
+
+
 def get_spectrum_data(signal):
     """
     Combines the energy axis values and summed spectrum data into a single dictionary.
@@ -227,8 +511,8 @@ def get_spectrum_data(signal):
 
     Returns:
         dict: Dictionary containing:
-            - 'x': list of energy values (the axis data)
-            - 'y': list of summed intensities
+            - 'x': NumPy array of energy values (the axis data, read-only)
+            - 'y': NumPy array of summed intensities (read-only)
             - 'x_label': string label for x-axis (e.g., 'Energy')
             - 'x_units': string units for x-axis (e.g., 'keV')
             - 'y_label': string label for y-axis (e.g., 'Counts')
@@ -238,9 +522,10 @@ def get_spectrum_data(signal):
     # Get the signal axis (usually energy for EDS)
     signal_axis = signal.axes_manager.signal_axes[0]
     
-    # Convert NumPy arrays to lists for JSON serialization
-    x_values = signal_axis.axis.tolist() if hasattr(signal_axis.axis, 'tolist') else list(signal_axis.axis)
-    y_values = signal.sum().data.tolist() if hasattr(signal.sum().data, 'tolist') else list(signal.sum().data)
+    # Arrays are returned as-is, ORJSONResponse serializes them directly
+    # (no per-channel Python floats); both are cached and read-only
+    x_values = get_axis_values(signal_axis)
+    y_values = get_summed_spectrum(signal)
 
     # Get zero peak information
     zero_index = get_zero_index(signal)
@@ -250,21 +535,7 @@ def get_spectrum_data(signal):
     if zero_index is not None:
         half_zero_height = get_half_zero_height(signal, zero_index)
         if half_zero_height is not None:
-            # Find FWHM point
-            tolerance = half_zero_height * 0.05  # 5% tolerance
-            for i in range(zero_index + 1, len(y_values)):
-                if abs(y_values[i] - half_zero_height) <= tolerance:
-                    fwhm_index = i
-                    break
-                elif y_values[i] < half_zero_height:
-                    # If we've gone below half max, use the closer of this point or previous point
-                    if i > zero_index + 1:
-                        prev_diff = abs(y_values[i-1] - half_zero_height)
-                        curr_diff = abs(y_values[i] - half_zero_height)
-                        fwhm_index = i if curr_diff < prev_diff else i-1
-                    else:
-                        fwhm_index = i
-                    break
+            fwhm_index = _find_fwhm_index(y_values, half_zero_height, zero_index)
 
     spectrum_data = {
         'x': x_values,
@@ -294,20 +565,27 @@ def get_zero_index(signal):
     Returns:
         int: Index where energy = 0, or None if not found
     """
+    # The index (or None) is stored on the signal after the first call
+    try:
+        return getattr(signal, _ZERO_INDEX_ATTR)
+    except AttributeError:
+        pass
+
     try:
         # Get the energy axis
         energy_axis = signal.axes_manager.signal_axes[0]
         
-        # Calculate index where energy = 0
-        zero_index = int(round(-energy_axis.offset / energy_axis.scale))
+        # Calculate index where energy = 0, as an int so it can index the spectrum
+        zero_index = int(round(float(energy_to_index(0.0, energy_axis.offset, energy_axis.scale))))
         
         # Verify the index is within bounds
-        if 0 <= zero_index < energy_axis.size:
-            return zero_index
-        return None
+        if not 0 <= zero_index < energy_axis.size:
+            zero_index = None
+        setattr(signal, _ZERO_INDEX_ATTR, zero_index)
+        return zero_index
         
     except Exception as e:
-        print(f"Error finding zero index: {str(e)}")
+        logger.exception("Error finding zero index")
         return None
 
 def get_half_zero_height(signal, zero_index):
@@ -322,58 +600,110 @@ def get_half_zero_height(signal, zero_index):
         float: Half of the height at zero peak
     """
     try:
-        # Get the summed spectrum data
-        spectrum_data = signal.sum().data
+        # Get the summed spectrum data (computed once per signal)
+        spectrum_data = get_summed_spectrum(signal)
         
         # Get height at zero peak
         height = float(spectrum_data[zero_index])
         return height / 2
         
     except Exception as e:
-        print(f"Error calculating half zero height: {str(e)}")
+        logger.exception("Error calculating half zero height")
         return None
 
-def get_fwhm_index(spectrum_data, half_zero_height, zero_index):
+if njit is not None:
+    @njit(cache=True)
+    def _fwhm_kernel(y, zero_index, half_zero_height, tolerance):
+        """
+        Compiled FWHM search: same rules as _find_fwhm_index, but stops at the
+        first matching channel. Returns -1 if the spectrum never reaches half max.
+        """
+        for i in range(zero_index + 1, y.shape[0]):
+            curr_diff = abs(y[i] - half_zero_height)
+            if curr_diff <= tolerance:
+                return i
+            if y[i] < half_zero_height:
+                # If we've gone below half max, use the closer of this point or previous point
+                if i > zero_index + 1:
+                    prev_diff = abs(y[i - 1] - half_zero_height)
+                    return i if curr_diff < prev_diff else i - 1
+                return i
+        return -1
+else:
+    _fwhm_kernel = None
+
+
+def warm_up_fwhm_kernel():
     """
-    Finds the index at the Full Width Half Maximum (FWHM) point after the zero peak.
-    
+    Compiles (or loads from Numba's on-disk cache) the FWHM kernel ahead of the first request,
+    for the dtypes summed spectra usually have (integer counts and float data).
+    Unsigned detector counts (uint8/uint16) sum to uint64, signed ones to int64.
+    """
+    for dtype in (np.uint64, np.int64, np.float32, np.float64):
+        _find_fwhm_index(np.array([4, 2, 1], dtype=dtype), 2.0, 0)
+
+
+# Channels examined in the first step of the NumPy FWHM search; each following
+# block is twice as large. The half-max crossing is usually a few channels after
+# the zero peak, so the search normally stops in the first small block instead of
+# comparing the whole spectrum, while a crossing far out still takes only
+# O(log N) blocks.
+FWHM_FIRST_BLOCK_SIZE = 16
+
+
+def _find_fwhm_index(y_values, half_zero_height, zero_index):
+    """
+    Finds the first point after the zero peak that is at (within 5%) or below half max.
+    If the spectrum drops below half max without hitting the tolerance band, the closer
+    of that point and the previous one is used.
+
+    Uses the Numba-compiled _fwhm_kernel when Numba is available. Otherwise
+    vectorized: the comparisons run on blocks of doubling size (starting at
+    FWHM_FIRST_BLOCK_SIZE channels) and np.argmax picks the first match, instead
+    of looping over channels in Python. Channels after the block containing the
+    crossing are never read. No monotonic-tail assumption is made, so the result
+    is the same as a channel-by-channel scan.
+
     Args:
-        spectrum_data (dict): Dictionary containing x and y values of the spectrum
+        y_values (array-like): Summed intensities
         half_zero_height (float): Half of the height at zero peak
         zero_index (int): Index where energy = 0
-        
+
     Returns:
-        int: Index at the FWHM point, or None if error
+        int: Index at the FWHM point, or None if the spectrum never reaches half max
     """
-    print(f"\n=== Starting get_fwhm_index() in data_functions.py ===")
-    try:
-        # Get y-values from spectrum data
-        y_values = spectrum_data['y']
-        if isinstance(y_values, np.ndarray):
-            y_values = y_values.tolist()
-            
-        tolerance = half_zero_height * 0.05  # 5% tolerance for finding half max
-        half_max_index = zero_index  # Default to zero index if no FWHM found
-        
-        # Find the FWHM point
-        for i in range(zero_index + 1, len(y_values)):
-            if abs(y_values[i] - half_zero_height) <= tolerance:
-                half_max_index = i
-                break
-            elif y_values[i] < half_zero_height:
-                # If we've gone below half max, use the closer of this point or previous point
-                if i > zero_index + 1:
-                    prev_diff = abs(y_values[i-1] - half_zero_height)
-                    curr_diff = abs(y_values[i] - half_zero_height)
-                    half_max_index = i if curr_diff < prev_diff else i-1
-                else:
-                    half_max_index = i
-                break
-        
-        print(f"Found FWHM index: {half_max_index}")
-        return half_max_index
-        
-    except Exception as e:
-        print(f"Error finding FWHM index: {str(e)}")
-        return None
+    y = np.asarray(y_values)
+    tolerance = half_zero_height * 0.05  # 5% tolerance
+
+    if _fwhm_kernel is not None:
+        # The kernel is compiled per dtype and stops a few channels after the zero
+        # peak, so the spectrum is passed as-is: converting it (to float64, or down
+        # to float32) would copy every channel only to read a handful of them.
+        # Summed counts can also exceed float32's exact integer range (2**24).
+        fwhm_index = _fwhm_kernel(np.ascontiguousarray(y), int(zero_index),
+                                  float(half_zero_height), float(tolerance))
+        return None if fwhm_index < 0 else int(fwhm_index)
+
+    block_start = zero_index + 1
+    block_size = FWHM_FIRST_BLOCK_SIZE
+    while block_start < len(y):
+        block = y[block_start:block_start + block_size].astype(np.float64, copy=False)
+
+        diff = np.abs(block - half_zero_height)
+        within_tolerance = diff <= tolerance
+        hits = within_tolerance | (block < half_zero_height)
+        if not hits.any():
+            block_start += block_size
+            block_size *= 2
+            continue
+
+        first = int(np.argmax(hits))  # argmax returns the first True
+        fwhm_index = block_start + first
+        if within_tolerance[first] or fwhm_index == zero_index + 1:
+            return fwhm_index
+
+        # Gone below half max, use the closer of this point or previous point
+        prev_diff = abs(float(y[fwhm_index - 1]) - half_zero_height)
+        return fwhm_index if diff[first] < prev_diff else fwhm_index - 1
 
+    return None
@@ -1,10 +1,37 @@
 from utils import constants
-import hyperspy.api as hs
+from operations.signal_functions import SignalList
 import os
 import time
+import logging
 import gc
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
+from cachetools import LRUCache
 
+logger = logging.getLogger(__name__)
+
+
+# Directory listing cache: {directory: (mtime_ns, expiry, files)}
+# The frontend polls /files, so listing is served from here as long as the
+# directory's mtime is unchanged (adding/removing a file bumps it) and the
+# entry hasn't expired. The TTL bounds staleness on filesystems with coarse
+# or unreliable directory mtimes (e.g. some network mounts).
+_dir_cache = {}
+DIR_CACHE_TTL = float(os.getenv("CRUCIBLE_FILE_LIST_TTL", 5.0))
+
+# Below is not full list of supported extensions
+# all supported extensions: https://hyperspy.org/hyperspy-doc/v1.0/user_guide/io.html#supported-formats
+SUPPORTED_EXTENSIONS = frozenset(('.emd', '.tif', '.dm3', '.dm4', '.ser', '.emi'))
+# Same, without the dot, for matching the part after rpartition('.')
+_SUPPORTED_SUFFIXES = frozenset(ext[1:] for ext in SUPPORTED_EXTENSIONS)
+
+
+def has_supported_extension(name):
+    # Only the suffix is lowercased, not the whole filename
+    _, dot, suffix = name.rpartition('.')
+    return bool(dot) and suffix.lower() in _SUPPORTED_SUFFIXES
 
 
 def list_files():
@@ -24,43 +51,112 @@ Includes:
 Returns:
     list: List of filenames with supported extensions
 """
-    print(f"\n=== Starting list_files() in file_functions.py ===")
-    try: # below is not full list of supported extensions
-         # all supported extensions: https://hyperspy.org/hyperspy-doc/v1.0/user_guide/io.html#supported-formats
-        supported_extensions = ('.emd', '.tif', '.dm3', '.dm4', '.ser', '.emi') 
-        print("\nReturning list from list_files() in file_functions.py")
-        files = [f for f in os.listdir(constants.DATA_DIR) if f.lower().endswith(supported_extensions)]
-        print("=== Ending list_files() in file_functions.py ===\n")
-        return files
+    logger.debug("Starting list_files()")
+    try:
+        directory = constants.DATA_DIR
+        mtime_ns = os.stat(directory).st_mtime_ns
+        now = time.monotonic()
+
+        cached = _dir_cache.get(directory)
+        if cached and cached[0] == mtime_ns and cached[1] > now:
+            logger.debug("Returning cached list from list_files()")
+            return list(cached[2])
+
+        logger.debug("Listing %s", directory)
+        with os.scandir(directory) as entries:
+            # is_file() uses the type scandir already read, normally without a stat call
+            files = [entry.name for entry in entries
+                     if has_supported_extension(entry.name) and entry.is_file()]
+        _dir_cache[directory] = (mtime_ns, now + DIR_CACHE_TTL, files)
+        return list(files)
     except Exception as e:
-        print(f"Error accessing directory {constants.DATA_DIR}: {str(e)}")
-        print("\nReturning empty list from list_files() in file_functions.py")
+        logger.error("Error accessing directory %s: %s; returning an empty list", constants.DATA_DIR, e)
         return []
 
 
 
 
+# Loaded files: {(filepath, mtime_ns): list of signals}
+# Keeps the most recently used files in memory, so flipping between a few files
+# doesn't re-parse them. Keying on the modification time means a file replaced
+# on disk is loaded again instead of served stale.
+#
+# The cache is bounded in bytes. Signal data held in RAM is charged at its size;
+# lazily loaded (Dask) data stays on disk and isn't counted. Every file is charged
+# at least one slot of SIGNAL_CACHE_BYTES / SIGNAL_CACHE_SIZE, so at most
+# SIGNAL_CACHE_SIZE files (and their open file handles) are kept.
+SIGNAL_CACHE_SIZE = int(os.getenv("CRUCIBLE_SIGNAL_CACHE_SIZE", 4))
+SIGNAL_CACHE_BYTES = int(os.getenv("CRUCIBLE_SIGNAL_CACHE_BYTES", 4 << 30))
+_MIN_ENTRY_BYTES = SIGNAL_CACHE_BYTES // SIGNAL_CACHE_SIZE
+
+
+def _in_memory_nbytes(signals):
+    """Bytes of signal data held in RAM; Dask arrays aren't counted"""
+    return sum(s.data.nbytes for s in signals if isinstance(s.data, np.ndarray))
+
+
+def _entry_size(signals):
+    return max(_in_memory_nbytes(signals), _MIN_ENTRY_BYTES)
+
+
+def _is_cacheable(signals):
+    """
+    Object arrays only report the size of their pointers in nbytes, so their real
+    size is unknown; files containing them (or larger than the whole cache) aren't cached.
+    """
+    if any(isinstance(s.data, np.ndarray) and s.data.dtype.hasobject for s in signals):
+        return False
+    return _entry_size(signals) <= SIGNAL_CACHE_BYTES
+
+
+_signal_cache = LRUCache(maxsize=SIGNAL_CACHE_BYTES, getsizeof=_entry_size)
+_cache_lock = threading.RLock()
+
+# One lock per file so concurrent requests for the same file wait for a single
+# load instead of parsing it twice; different files still load in parallel
+_load_locks = {}
+
+
+def _make_room_for_load():
+    """
+    Evicts least recently used files until a new file fits in at least one slot.
+    Called before hs.load, so the evicted signals are released before the new file
+    is read instead of after it is inserted (when old and new would both be in memory).
+    Evicted signals aren't closed explicitly: a request may still be using them, and
+    their data files are closed when the signals are garbage collected.
+    """
+    evicted = False
+    with _cache_lock:
+        while _signal_cache and _signal_cache.currsize + _MIN_ENTRY_BYTES > _signal_cache.maxsize:
+            _signal_cache.popitem()
+            evicted = True
+    if evicted:
+        gc.collect()
+
+
+def _cache_key(file_path):
+    return (file_path, os.stat(file_path).st_mtime_ns)
+
+
+def _select_signal(signals, signal_idx):
+    if signal_idx is not None:
+        return signals[signal_idx] # Most frontend functions call this function with signal_idx
+    return signals # For get signal list return all signals
+
+
 def get_cached_file(file_path, signal_idx=None):
-    print("\n=== Starting get_cached_file() in file_functions.py ===")
-    print(f"Checking cache for filepath: {file_path}")
-    print(f"Current cached filepath: {constants.CURRENT_FILE['filepath']}")
-    
-    if constants.CURRENT_FILE["filepath"] == file_path:
-        print("Filepath match found in cache")
-        if constants.CURRENT_FILE["data"] is not None:
-            if signal_idx is not None:
-                print(f"=== Returning signal at index {signal_idx} from cache ===")
-                return constants.CURRENT_FILE["data"][signal_idx] # Most frontend functions call this function with signal_idx
-            else:
-                print(f"=== Returning all signals from cache ===")
-                return constants.CURRENT_FILE["data"] # For get signal list return all signals
-        else:
-            print("Cache entry exists but data is None")
-            return None
-    else:
-        print("No matching filepath in cache")
+    logger.debug("Checking cache for filepath: %s", file_path)
+
+    with _cache_lock:
+        signals = _signal_cache.get(_cache_key(file_path))
+
+    if signals is None:
+        logger.debug("No matching filepath in cache")
         return None
 
+    logger.debug("Filepath match found in cache")
+    return _select_signal(signals, signal_idx)
+
 
 
 """
@@ -82,55 +178,125 @@ Raises:
     ValueError: If the file cannot be loaded with any of the supported signal types
 """
 def load_file(filepath, signal_idx=None):
-    print(f"\n=== Starting load_file in file_functions.py ===")
-    
-    # Clear existing cache if loading a different file
-    if constants.CURRENT_FILE["filepath"] != filepath:
-        print("Clearing existing cache")
-        constants.CURRENT_FILE["data"] = None
-        gc.collect()  # Force garbage collection
-        
-    signal_types = [None, 'EMD', 'EDS_TEM', 'EDS_SEM']  # None means try without specifying type
+    logger.debug("Starting load_file(%s)", filepath)
+
+    with _cache_lock:
+        load_lock = _load_locks.setdefault(filepath, threading.Lock())
+
+    with load_lock:
+        # Another request may have loaded the file while we waited for the lock
+        cached = get_cached_file(filepath, signal_idx)
+        if cached is not None:
+            return cached
+        signals = _load_file(filepath, signal_idx)
+
+    _prefetch_siblings(filepath)
+    return signals
+
+
+# Gatan acquisitions are saved as a series of DM3/DM4 files that are usually
+# opened one after another. After loading one, the next PREFETCH_COUNT files of
+# the same type (in name order) are handed to the kernel's readahead with
+# posix_fadvise(WILLNEED), so their bytes are in the page cache by the time
+# they are opened. Set CRUCIBLE_PREFETCH_COUNT=0 to disable.
+PREFETCH_COUNT = int(os.getenv("CRUCIBLE_PREFETCH_COUNT", 2))
+_PREFETCH_EXTENSIONS = frozenset(('.dm3', '.dm4'))
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+
+def _fadvise_willneed(filepath):
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.debug("Prefetch of %s failed: %s", filepath, e)
+
+
+def _prefetch_siblings(filepath):
+    """
+    Starts readahead of the files that follow filepath in the data directory.
+    Only for DM3/DM4 series, and only where posix_fadvise exists (not on Windows).
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    if PREFETCH_COUNT <= 0 or extension not in _PREFETCH_EXTENSIONS or not hasattr(os, 'posix_fadvise'):
+        return
+
+    directory, name = os.path.split(filepath)
+    if directory != constants.DATA_DIR:
+        return
+    siblings = sorted(f for f in list_files() if os.path.splitext(f)[1].lower() == extension)
+    following = [f for f in siblings if f > name][:PREFETCH_COUNT]
+    for sibling in following:
+        _prefetch_executor.submit(_fadvise_willneed, os.path.join(directory, sibling))
+
+
+# Signal types to try per file extension, in order (None means auto-detect).
+# Only EMD files need the fallbacks; every other format is loaded by HyperSpy's
+# auto-detected reader on the first attempt, so no speculative opens are made.
+_SIGNAL_TYPES_FOR_EXT = {
+    '.emd': (None, 'EMD', 'EDS_TEM', 'EDS_SEM'),
+}
+_DEFAULT_SIGNAL_TYPES = (None,)
+
+
+def _load_file(filepath, signal_idx=None):
+    # Imported here rather than at the top: hyperspy.api pulls in scipy, dask,
+    # matplotlib and h5py, which listing files and cache lookups don't need.
+    # After the first load it is just a sys.modules lookup.
+    import hyperspy.api as hs
+
+    key = _cache_key(filepath)
+    extension = os.path.splitext(filepath)[1].lower()
+    signal_types = _SIGNAL_TYPES_FOR_EXT.get(extension, _DEFAULT_SIGNAL_TYPES)
+    _make_room_for_load()
     
     for signal_type in signal_types:
         try:
-            print(f"Attempting to load file: {os.path.basename(filepath)}")
-            print(f"Using signal type: {signal_type if signal_type else 'auto-detect'}")
+            logger.debug("Attempting to load file %s with signal type %s",
+                         os.path.basename(filepath), signal_type or 'auto-detect')
             
             # Start timer
             start_time = time.time()
             
-            # Load the file
+            # Load the file lazily: HyperSpy reads the metadata and wraps the
+            # datasets in Dask arrays, so data is only read from disk when a
+            # slice or reduction of it is computed (see data_functions.compute_array)
             if signal_type:
-                signal = hs.load(filepath, reader=signal_type)
+                signal = hs.load(filepath, reader=signal_type, lazy=True)
             else:
-                signal = hs.load(filepath)
+                signal = hs.load(filepath, lazy=True)
             
             # End timer
             load_time = time.time() - start_time
-            print(f"File loaded successfully in {load_time:.2f} seconds")
+            logger.info("Loaded %s in %.2f seconds", os.path.basename(filepath), load_time)
             
-            # Return a list of signals for standardization, all functions that call
-            # this function expect a list of signals
-            if not isinstance(signal, list):
-                if signal_idx is not None:
-                    signal = signal[signal_idx]
-                else:
-                    signal = [signal]
+            # Cache a list of signals for standardization, all functions that call
+            # this function expect a list of signals. SignalList also records which
+            # signal is the HAADF image, once per load.
+            signals = SignalList(signal if isinstance(signal, list) else [signal])
             
-            # Update cache
-            constants.CURRENT_FILE["filepath"] = filepath
-            constants.CURRENT_FILE["data"] = signal
+            # Update cache, dropping least recently used files until it fits
+            if _is_cacheable(signals):
+                with _cache_lock:
+                    _signal_cache[key] = signals
+                gc.collect()  # Release the arrays of an evicted file right away
+            else:
+                logger.warning("Not caching %s: size unknown or larger than the cache",
+                               os.path.basename(filepath))
             
-            print("=== Ending load_file in file_functions.py ===\n")
-            return signal
+            break
             
         except Exception as e:
-            print(f"Failed with signal_type {signal_type}: {str(e)}")
+            logger.debug("Failed with signal_type %s: %s", signal_type, e)
             continue
-    
-    print("=== Ending load_file with error in file_functions.py ===\n")
-    raise ValueError("Could not load file with any signal type")
+    else:
+        logger.error("Could not load %s with any signal type", os.path.basename(filepath))
+        raise ValueError("Could not load file with any signal type")
+
+    return _select_signal(signals, signal_idx)
 
 
 
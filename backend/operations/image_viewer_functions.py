@@ -1,6 +1,10 @@
 import numpy as np
+import logging
+from operations.data_functions import compute_array, get_summed_image
 from typing import Dict, Any, Optional
 
+logger = logging.getLogger(__name__)
+
 def extract_image_data(signal) -> Optional[Dict[str, Any]]:
     """
     Extracts 2D image data from a HyperSpy signal object.
@@ -11,7 +15,7 @@ def extract_image_data(signal) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary containing:
             - data_shape: Original shape of the signal data
-            - image_data: 2D array of image data (as list)
+            - image_data: 2D NumPy array of image data
             - image_shape: Shape of the processed 2D image
             - data_range: Min and max values of the data
             
@@ -20,7 +24,7 @@ def extract_image_data(signal) -> Optional[Dict[str, Any]]:
         TypeError: If signal data is not in expected format
         Exception: For other processing errors
     """
-    print("\n=== Starting extract_image_data() in image_viewer_functions.py ===")
+    logger.debug("Starting extract_image_data()")
     
     try:
         # Validate input
@@ -28,35 +32,48 @@ def extract_image_data(signal) -> Optional[Dict[str, Any]]:
             raise TypeError("Input signal must have 'data' attribute")
             
         # Get the shape of the data
-        data_shape = signal.data.shape
-        print(f"Input signal shape: {data_shape}")
+        data = signal.data
+        data_shape = data.shape
+        logger.debug("Input signal shape: %s, data type: %s", data_shape, data.dtype)
         
         # Process data based on dimensions
-        print("Processing image data...")
-        print(f"Input data type: {signal.data.dtype}")
-        print(f"Input data range: [{signal.data.min()}, {signal.data.max()}]")
-        
         if len(data_shape) == 2:
-            image_data = signal.data
-            print("2D signal - using data directly")
+            image_data = compute_array(data)
+            logger.debug("2D signal - using data directly")
         elif len(data_shape) == 3:
-            image_data = np.sum(signal.data, axis=2)
-            print("3D signal - summing across spectrum dimension")
+            # Summed once per loaded signal, later requests reuse it
+            image_data = get_summed_image(signal)
+            logger.debug("3D signal - summing across spectrum dimension")
         else:
             raise ValueError(f"Signal must be 2D or 3D, got shape {data_shape}")
             
-        # Record processed data properties
+        # Record processed data properties. The range is taken from the 2D image,
+        # which is already in memory; the 3D cube is only read once, by the sum.
         image_shape = image_data.shape
         data_min = float(image_data.min())
         data_max = float(image_data.max())
         
-        print(f"Processed image shape: {image_shape}")
-        print(f"Processed data range: [{data_min}, {data_max}]")
+        logger.debug("Processed image shape: %s, data range: [%s, %s]", image_shape, data_min, data_max)
+        
+        # Images are only displayed, so float and 64-bit integer pixels (e.g. counts
+        # summed over the spectrum axis) are reduced to float32, half the memory and
+        # bytes on the wire. Narrow integer images (uint8/uint16) are already smaller
+        # and are kept exact. data_range above holds the original range.
+        if image_data.dtype.kind == 'f' or image_data.dtype.itemsize == 8:
+            image_data = image_data.astype(np.float32, copy=False)
+        
+        # DM3/DM4/SER pixels may be stored big-endian. orjson reads array memory
+        # as native order (a >u2 [1] would serialize as 256) and the binary format
+        # sends the raw bytes, so the image is brought to native byte order first
+        # (a no-op for native data).
+        image_data = image_data.astype(image_data.dtype.newbyteorder('='), copy=False)
         
         # Prepare return data
         result = {
             "data_shape": data_shape,
-            "image_data": image_data.astype(float).tolist(),
+            # Left as an array: ORJSONResponse serializes it in C and the binary
+            # format sends its bytes, so no Python list of floats is built
+            "image_data": np.ascontiguousarray(image_data),
             "image_shape": image_shape,
             "data_range": {
                 "min": data_min,
@@ -64,17 +81,14 @@ def extract_image_data(signal) -> Optional[Dict[str, Any]]:
             }
         }
         
-        print("=== Successfully completed extract_image_data() in image_viewer_functions.py ===\n")
         return result
         
     except ValueError as ve:
-        print(f"ValueError in extract_image_data: {str(ve)}")
+        logger.error("ValueError in extract_image_data: %s", ve)
         raise  # Re-raise for handling by service layer
     except TypeError as te:
-        print(f"TypeError in extract_image_data: {str(te)}")
+        logger.error("TypeError in extract_image_data: %s", te)
         raise  # Re-raise for handling by service layer
     except Exception as e:
-        print(f"Unexpected error in extract_image_data: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Unexpected error in extract_image_data")
         raise  # Re-raise for handling by service layer
\ No newline at end of file
@@ -1,6 +1,48 @@
 import xraylib as xrl
 
 
+# Emission lines reported for every element: (result key, xraylib line constant)
+EMISSION_LINES = (
+    # K lines
+    ("ka1", xrl.KA1_LINE),
+    ("ka2", xrl.KA2_LINE),
+    ("kb1", xrl.KB1_LINE),
+    # L lines
+    ("la1", xrl.LA1_LINE),
+    ("la2", xrl.LA2_LINE),
+    ("lb1", xrl.LB1_LINE),
+    ("lb2", xrl.LB2_LINE),
+    # Gamma and M lines
+    ("lg1", xrl.LG1_LINE),
+    ("ma1", xrl.MA1_LINE),
+)
+
+MAX_ATOMIC_NUMBER = 118
+
+
+def _compute_emission_spectra(atomic_number: int):
+    """
+    Looks up the energy of every line in EMISSION_LINES with xraylib.
+    Lines that don't exist for the element are None.
+    """
+    energies = {}
+    for key, line in EMISSION_LINES:
+        try:
+            energies[key] = xrl.LineEnergy(atomic_number, line)
+        except ValueError:
+            # Line not available for this element
+            energies[key] = None
+    return energies
+
+
+# Line energies are static reference data, so the whole table is built once at
+# import (118 elements x 9 lines) and requests only do a dict lookup
+_EMISSION_TABLE = {
+    atomic_number: _compute_emission_spectra(atomic_number)
+    for atomic_number in range(1, MAX_ATOMIC_NUMBER + 1)
+}
+
+
 def get_emission_spectra(atomic_number: int):
     """
     Gets the emission spectra for a specific element.
@@ -10,72 +52,10 @@ def get_emission_spectra(atomic_number: int):
         dict: Dictionary containing emission spectra data for various emission lines (K and L).
               Returns None for lines that are not available for the given element.
     """
-    print(f"\n=== Starting get_emission_spectra() in periodic_table_functions.py ===")
-    
-    # Initialize all energies to None
-    ka1_energy = ka2_energy = kb1_energy = None
-    la1_energy = la2_energy = lb1_energy = lb2_energy = None
-    lg1_energy = ma1_energy = None
-    
-    # K lines
-    try:
-        ka1_energy = xrl.LineEnergy(atomic_number, xrl.KA1_LINE)
-    except ValueError:
-        # KA1 line not available for this element
-        pass
-
-    try:
-        ka2_energy = xrl.LineEnergy(atomic_number, xrl.KA2_LINE)
-    except ValueError:
-        pass
-
-    try:
-        kb1_energy = xrl.LineEnergy(atomic_number, xrl.KB1_LINE)
-    except ValueError:
-        pass
-
-    # L lines
-    try:
-        la1_energy = xrl.LineEnergy(atomic_number, xrl.LA1_LINE)
-    except ValueError:
-        pass
-
-    try:
-        la2_energy = xrl.LineEnergy(atomic_number, xrl.LA2_LINE)
-    except ValueError:
-        pass
-
-    try:
-        lb1_energy = xrl.LineEnergy(atomic_number, xrl.LB1_LINE)
-    except ValueError:
-        pass
-
-    try:
-        lb2_energy = xrl.LineEnergy(atomic_number, xrl.LB2_LINE)
-    except ValueError:
-        pass
-
-    # Gamma and M lines
-    try:
-        lg1_energy = xrl.LineEnergy(atomic_number, xrl.LG1_LINE)
-    except ValueError:
-        pass
-
-    try:
-        ma1_energy = xrl.LineEnergy(atomic_number, xrl.MA1_LINE)
-    except ValueError:
-        pass
-        
-        
-    print(f"\n=== Ending get_emission_spectra() in periodic_table_functions.py ===")    
-    return {
-        "ka1": ka1_energy,
-        "ka2": ka2_energy,
-        "kb1": kb1_energy,
-        "la1": la1_energy,
-        "la2": la2_energy,
-        "lb1": lb1_energy,
-        "lb2": lb2_energy,
-        "lg1": lg1_energy,
-        "ma1": ma1_energy
-    }
\ No newline at end of file
+    energies = _EMISSION_TABLE.get(atomic_number)
+    if energies is None:
+        # Outside the periodic table no line exists (xraylib would raise ValueError
+        # for each one), so the answer is known without calling it
+        return dict.fromkeys(key for key, _ in EMISSION_LINES)
+    # Copy so callers can't modify the shared table
+    return dict(energies)
@@ -1,5 +1,44 @@
-from utils.constants import DATA_DIR, CURRENT_FILE
 import os
+import logging
+import operator
+
+logger = logging.getLogger(__name__)
+
+_title_getter = operator.attrgetter('metadata.General.title')
+_shape_getter = operator.attrgetter('data.shape')
+
+
+def _title(sig):
+    try:
+        return _title_getter(sig)
+    except AttributeError:
+        return ''
+
+
+def _dims(sig):
+    try:
+        return len(_shape_getter(sig))
+    except AttributeError:
+        return None
+
+
+class SignalList(list):
+    """
+    The signals of a loaded file, as stored in the file cache.
+
+    Signals are never added or removed after loading, so the HAADF signal is
+    found once here instead of scanning the titles on every /haadf-data request.
+
+    Attributes:
+        haadf_index (int or None): Index of the first signal titled HAADF (any case),
+            None if there is none
+    """
+    __slots__ = ('haadf_index',)
+
+    def __init__(self, signals):
+        super().__init__(signals)
+        self.haadf_index = next(
+            (idx for idx, sig in enumerate(self) if 'HAADF' in _title(sig).upper()), None)
 
 
 def extract_signal_list(signal_list):
@@ -20,47 +59,21 @@ def extract_signal_list(signal_list):
      # Extract info from each signal
     for idx, sig in enumerate(signal_list):
         try:
-            # print(f"\nProcessing signal {idx}:")
-            # print(f"Signal object type: {type(sig)}")
-            
-            # Get title with fallback
-            title = "Signal " + str(idx)  # Default title
+            # One C-level lookup per field; a signal missing metadata or data
+            # raises AttributeError once instead of walking hasattr checks
             try:
-                if hasattr(sig, 'metadata'):
-                    # print("Has metadata attribute")
-                    if hasattr(sig.metadata, 'General'):
-                        # print("Has General metadata")
-                        if hasattr(sig.metadata.General, 'title'):
-                            title = sig.metadata.General.title
-                            # print(f"Found title in metadata: {title}")
-                        else:
-                            print("No title in General metadata")
-                    else:
-                        print("No General section in metadata")
-                else:
-                    print("No metadata attribute")
-            except Exception as e:
-                print(f"Error accessing metadata: {str(e)}")
+                title = _title_getter(sig)
+            except AttributeError:
+                logger.debug("Signal %s has no metadata.General.title", idx)
+                title = f"Signal {idx}"
             
-            # Get shape with fallback
-            shape = None
             try:
-                if hasattr(sig, 'data'):
-                    # print("Has data attribute")
-                    shape = sig.data.shape
-                    # print(f"Data shape: {shape} ({len(shape)}D signal)")
-                else:
-                    print("No data attribute")
-            except Exception as e:
-                print(f"Error accessing data shape: {str(e)}")
+                shape = _shape_getter(sig)
+            except AttributeError:
+                logger.debug("Signal %s has no data shape", idx)
+                shape = None
             
-            # Get signal type
-            try:
-                sig_type = type(sig).__name__
-                # print(f"Signal type: {sig_type}")
-            except Exception as e:
-                print(f"Error getting signal type: {str(e)}")
-                sig_type = "Unknown"
+            sig_type = type(sig).__name__
             
             # Get signal capabilities
             capabilities = get_signal_capabilities(sig)
@@ -78,15 +91,26 @@ def extract_signal_list(signal_list):
             
             
         except Exception as e:
-            print(f"Error processing signal {idx}: {str(e)}")
+            logger.warning("Error processing signal %s: %s", idx, e)
             # Continue with next signal instead of failing completely
             continue
         
-    print(f"\n=== Processed {len(signals_info)} signals successfully ===")
+    logger.debug("Processed %d signals successfully", len(signals_info))
     
     return signals_info
 
 
+# Capabilities by number of dimensions (1D spectrum, 2D image, 3D datacube).
+# The dicts are shared by every caller and must not be modified.
+_CAPABILITIES_BY_DIMS = (
+    None,
+    {"hasSpectrum": True, "hasImage": False},   # 1D spectrum
+    {"hasSpectrum": False, "hasImage": True},   # 2D image
+    {"hasSpectrum": True, "hasImage": True},    # 3D datacube
+)
+_NO_CAPABILITIES = {"hasSpectrum": False, "hasImage": False}
+
+
 """Determine what a signal can be used for based on its shape and type
 
 Args:
@@ -98,74 +122,7 @@ Returns:
         - hasImage (bool): True if signal can be viewed as image (2D or 3D)
 """
 def get_signal_capabilities(signal):
-    # print(f"\n=== Starting get_signal_capabilities() in file_service.py ===")
-    # print(f"Checking capabilities for signal of type: {type(signal)}")
-    
-    if not hasattr(signal, 'data') or not hasattr(signal.data, 'shape'):
-        # print("Signal has no data or shape")
-        # print("=== Ending get_signal_capabilities() in file_service.py ===\n")
-        return {"hasSpectrum": False, "hasImage": False}
-        
-    shape = signal.data.shape
-    dims = len(shape)
-    # print(f"Signal shape: {shape} ({dims}D)")
-    
-    capabilities = {
-        "hasSpectrum": dims == 1 or dims == 3,  # 1D spectrum or 3D datacube
-        "hasImage": dims == 2 or dims == 3      # 2D image or 3D datacube
-    }
-    
-    # print(f"Signal capabilities: {capabilities}")
-    # print("=== Ending get_signal_capabilities()  in file_service.py ===\n")
-    return capabilities
-
-
-def find_haadf_signal(signal_list):
-    
-    """
-    Find the HAADF image from a list of hyperspy signals.
-
-    Args:
-        signal_list (list): List of hyperspy signals
-        
-    Returns:
-        tuple: (index, signal) of the HAADF image, or (None, None) if not found
-    """
-    print(f"\n=== Starting find_haadf_signal() in signal_functions.py ===")
-    for idx, sig in enumerate(signal_list):
-        if hasattr(sig, 'metadata'):
-            title = sig.metadata.General.title if hasattr(sig.metadata, 'General') else ''
-            if 'HAADF' in title and len(sig.data.shape) == 2:
-                print(f"Found HAADF signal at index {idx}, end find_haadf_signal() in signal_functions.py")
-                return idx, sig
-    print(f"No HAADF signal found in the file, end find_haadf_signal() in signal_functions.py")
-    return None, None
-
-
-def find_3d_signals(signal_list):
-    
-    """
-    Find all 3D signals from a list of hyperspy signals.
-
-    Args:
-        signal_list (list): List of hyperspy signals
-        
-    Returns:
-        list: List of tuples [(index, signal), ...] for all 3D signals found, or empty list if none found
-    """
-    print(f"\n=== Starting find_3d_signals() in signal_functions.py ===")
-    found_signals = []
-    for idx, sig in enumerate(signal_list):
-        if hasattr(sig, 'data'):
-            if len(sig.data.shape) == 3:
-                print(f"Found 3D signal at index {idx} with shape {sig.data.shape}")
-                found_signals.append((idx, sig))
-    
-    if found_signals:
-        print(f"Found {len(found_signals)} 3D signals in the file")
-    else:
-        print("No 3D signals found in the file")
-    
-    print(f"=== Ending find_3d_signals() in signal_functions.py ===")
-    
-    return found_signals
+    dims = _dims(signal)
+    if dims is None or not 1 <= dims <= 3:
+        return _NO_CAPABILITIES
+    return _CAPABILITIES_BY_DIMS[dims]
@@ -1,4 +1,8 @@
 import numpy as np
+import logging
+from operations.data_functions import compute_array, sum_region
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -8,34 +12,38 @@ import numpy as np
 Args:
     signal: A HyperSpy signal object
 Returns:
-    list: List of intensity values representing the spectrum
+    numpy.ndarray: Intensity values (1D signals) or summed intensities (3D signals),
+                   serialized by ORJSONResponse
     
 Raises:
     ValueError: If signal cannot be displayed as a spectrum
 """
 def extract_whole_spectrum_data(signal):
-    print(f"\n=== Starting extract_spectrum_data() in spectrum_viewer_functions.py ===")
-
-    if not hasattr(signal, 'data') or not hasattr(signal.data, 'shape'):
-        print("=== Ending extract_spectrum_data() in spectrum_viewer_functions.py with error ===\n")
+    data = getattr(signal, 'data', None)
+    shape = getattr(data, 'shape', None)
+    if shape is None:
         raise ValueError("Signal has no data or shape")
         
-    shape = signal.data.shape
     dims = len(shape)
-    print(f"Signal dimensions: {dims}")
+    logger.debug("extract_whole_spectrum_data: signal shape %s", shape)
     
     if dims == 1:
-        # For 1D signals, use data directly as spectrum
-        print("=== Ending extract_spectrum_data() in spectrum_viewer_functions.py successfully ===\n")
-        return signal.data.tolist() #Returns the data from the numpy array as a list
+        # For 1D signals, use data directly as spectrum. Kept as an array (orjson
+        # only serializes C-contiguous ones) so no Python list of channels is built
+        return np.ascontiguousarray(compute_array(data))
     elif dims == 3:
-        # For 3D signals, sum along both spatial dimensions (0 and 1) to get a 1D spectrum
-        print("Original shape: ", signal.data.shape)
-        summed_data = np.sum(signal.data, axis=(0, 1))
-        print("Shape after summing: ", summed_data.shape)
-        return summed_data.tolist() #Returns the data from the numpy array as a list
+        # For 3D signals, sum along both spatial dimensions (0 and 1) to get a 1D spectrum.
+        # Float data is accumulated in float64; integer counts are summed exactly.
+        accumulate_dtype = np.float64 if data.dtype.kind == 'f' else None
+        if isinstance(data, np.ndarray):
+            # One reduction over the flattened spatial axes (a view for C-ordered data)
+            height, width, channels = shape
+            summed_data = data.reshape(height * width, channels).sum(axis=0, dtype=accumulate_dtype)
+        else:
+            # Lazily loaded: Dask reduces chunk by chunk
+            summed_data = compute_array(data.sum(axis=(0, 1), dtype=accumulate_dtype))
+        return summed_data
     else:
-        print("=== Ending extract_spectrum_data() in spectrum_viewer_functions.py with error ===\n")
         raise ValueError(f"Signal with {dims} dimensions cannot be displayed as spectrum")
 
 
@@ -47,16 +55,15 @@ def extract_whole_spectrum_data(signal):
 Args:
     signal: A HyperSpy signal object
 Returns:
-    list: List of intensity values representing the spectrum
+    numpy.ndarray: Summed intensities of the region, serialized by ORJSONResponse
     
 Raises:
     ValueError: If signal cannot be displayed as a spectrum
 """
 def extract_spectrum_range(signal, region: dict):
-    print(f"\n=== Starting extract_spectrum_range() in spectrum_viewer_functions.py ===")
-
-    if not hasattr(signal, 'data') or not hasattr(signal.data, 'shape'):
-        print("=== Ending extract_spectrum_range() in spectrum_viewer_functions.py with error ===\n")
+    data = getattr(signal, 'data', None)
+    shape = getattr(data, 'shape', None)
+    if shape is None:
         raise ValueError("Signal has no data or shape")
         
     # Extract coordinates
@@ -65,26 +72,17 @@ def extract_spectrum_range(signal, region: dict):
     x1, y1 = region['x1'], region['y1']
     x2, y2 = region['x2'], region['y2']
     
-    print(f"\nReceived coordinates from frontend:")
-    print(f"x1, y1: ({x1}, {y1})")
-    print(f"x2, y2: ({x2}, {y2})")
+    logger.debug("extract_spectrum_range: region (%s, %s) to (%s, %s)", x1, y1, x2, y2)
     
     # Ensure coordinates are within bounds
-    height, width, _ = signal.data.shape
-    print(f"\nSignal data shape: {signal.data.shape}")
-    print(f"Height x Width: {height} x {width}")
-    
-    x1 = max(0, min(x1, width - 1))
-    x2 = max(0, min(x2, width - 1))
-    y1 = max(0, min(y1, height - 1))
-    y2 = max(0, min(y2, height - 1))
-    
-    # Ensure x1 < x2 and y1 < y2
-    x1, x2 = min(x1, x2), max(x1, x2)
-    y1, y2 = min(y1, y2), max(y1, y2)
+    height, width, _ = shape
     
-    region_data = signal.data[y1:y2+1, x1:x2+1, :]
+    # Clamp to the image and order each pair so that x1 <= x2 and y1 <= y2
+    # (plain Python: four ints don't need NumPy)
+    x1, x2 = sorted((min(max(x1, 0), width - 1), min(max(x2, 0), width - 1)))
+    y1, y2 = sorted((min(max(y1, 0), height - 1), min(max(y2, 0), height - 1)))
     
-    summed_spectrum = np.sum(region_data, axis=(0, 1))
+    # Bounds above are inclusive
+    summed_spectrum = sum_region(data, y1, y2 + 1, x1, x2 + 1)
     
-    return summed_spectrum.tolist()
+    return summed_spectrum
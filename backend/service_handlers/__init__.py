@@ -1,17 +1,17 @@
 from .file_service import FileService
 from .signal_service import SignalService
 from .data_service import DataService
+import logging
 
-print("\n=== Initializing Services ===")
+logger = logging.getLogger(__name__)
+logger.debug("=== Initializing Services ===")
 
 # Create instances of our services
 file_service = FileService()
 signal_service = SignalService(file_service)
 data_service = DataService(file_service)
 
-print("FileService initialized")
-print("SignalService initialized")
-print("=== Services Initialization Complete ===\n")
+logger.debug("FileService, SignalService and DataService initialized")
 
 # Export the service instances
 __all__ = ['file_service', 'signal_service', 'data_service'] 
\ No newline at end of file
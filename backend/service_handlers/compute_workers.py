@@ -0,0 +1,38 @@
+"""
+Entry points for the process pool created in main.py's lifespan.
+
+The region and energy-range endpoints do NumPy reductions over multi-MB datacubes.
+Running them in a separate process keeps them off the event loop and lets several
+requests use several cores instead of sharing one GIL.
+
+Functions here must stay module-level so they can be pickled by reference.
+They take the filename rather than a signal object: each worker process loads the
+file through its own file_service, which caches it for subsequent requests.
+"""
+
+from service_handlers import signal_service
+
+
+def compute_energy_range_image(filename: str, signal_idx: int, start: int, end: int):
+    """Worker wrapper for SignalService.spectrum_to_2d"""
+    return signal_service.spectrum_to_2d(filename, signal_idx, start, end)
+
+
+def compute_emission_spectra_width_sum(filename: str, signal_idx: int, start: float, end: float):
+    """Worker wrapper for SignalService.get_emission_spectra_width_sum"""
+    return signal_service.get_emission_spectra_width_sum(filename, signal_idx, start, end)
+
+
+def compute_region_spectra(filename: str, signal_idx: int, regions: list):
+    """
+    Worker entry point for a batch of regions of the same signal
+    (see service_handlers/region_batcher.py).
+    All regions are summed in one pass over the datacube. A malformed region
+    doesn't fail the batch: its exception is returned in its slot instead of a
+    result. If the signal itself can't be used (file missing, not 3D), every
+    slot gets that exception, as each region would have failed with it.
+    """
+    try:
+        return signal_service.get_spectra_from_2d_ranges(filename, signal_idx, regions)
+    except Exception as e:
+        return [e] * len(regions)
@@ -1,5 +1,9 @@
 from operations import periodic_table_functions
 from operations import data_functions
+import logging
+
+logger = logging.getLogger(__name__)
+
 
 class DataService:
     def __init__(self, file_service):
@@ -13,7 +17,7 @@ class DataService:
         Returns:
             dict: Dictionary containing emission spectra data
         """
-        print(f"\n=== Starting get_emission_spectra() in DataService ===")
+        # Served from the table periodic_table_functions builds at import
         return periodic_table_functions.get_emission_spectra(atomic_number)
 
     def get_zero_peak_width(self, filename, signal_idx):
@@ -25,37 +29,34 @@ class DataService:
         Returns:
             dict: Dictionary containing zero peak width data
         """
-        print(f"\n=== Starting get_zero_peak_width() in DataService ===")
+        logger.debug("=== Starting get_zero_peak_width() in DataService ===")
         signal = self.file_service.get_or_load_file(filename, signal_idx)
 
-        print(f"\n=== signal is {signal} in data_service.py ===")
-
-        zero_index = data_functions.get_zero_index(signal)
-        if zero_index is None:
-            print(f"\n=== zero_index is None in data_service.py ===")
-            return 0
-            
-        half_zero_height = data_functions.get_half_zero_height(signal, zero_index)
-        if half_zero_height is None:
-            print(f"\n=== half_zero_height is None in data_service.py ===")
-            return 0
+        logger.debug("=== signal is %s in data_service.py ===", signal)
 
+        # get_spectrum_data already locates the zero peak and its FWHM point
+        # (vectorized), so reuse its result instead of searching the spectrum again
         spectrum_data = data_functions.get_spectrum_data(signal)
         if spectrum_data is None:
-            print(f"\n=== spectrum_data is None in data_service.py ===")
+            logger.debug("=== spectrum_data is None in data_service.py ===")
+            return 0
+
+        zero_index = spectrum_data['zero_index']
+        if zero_index is None:
+            logger.debug("=== zero_index is None in data_service.py ===")
             return 0
 
-        fwhm_index = data_functions.get_fwhm_index(spectrum_data, half_zero_height, zero_index)
+        fwhm_index = spectrum_data['fwhm_index']
         if fwhm_index is None:
-            print(f"\n=== fwhm_index is None in data_service.py ===")
+            logger.debug("=== fwhm_index is None in data_service.py ===")
             return 0
 
         axes_data = data_functions.load_axes_manager(signal)
         
         width_index = abs(fwhm_index - zero_index) 
-        print(f"\n=== width_index is {width_index} in data_service.py ===")
+        logger.debug("=== width_index is %s in data_service.py ===", width_index)
 
-        width_keV = (width_index * axes_data['scale'])
-        print(f"\n=== width_keV is {width_keV} in data_service.py ===")
+        width_keV = (width_index * axes_data.scale)
+        logger.debug("=== width_keV is %s in data_service.py ===", width_keV)
         
         return width_keV
\ No newline at end of file
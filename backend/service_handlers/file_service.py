@@ -2,21 +2,17 @@ from typing import Any, List, Dict, Union
 from operations import file_functions
 from utils import constants
 import os
-from typing import Any
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class FileService:
     """
     Service class for handling file operations.
     Manages file loading, listing, and metadata extraction.
+    Loaded files are cached in file_functions (see _signal_cache).
     """
-    
-    def __init__(self):
-        self._supported_extensions = ('.emd', '.tif', '.dm3', '.dm4', '.ser', '.emi')
-        self._current_file = {
-            "filepath": None,
-            "data": None
-        }
 
     def list_files(self) -> list:
         """
@@ -26,12 +22,12 @@ class FileService:
             list: List of filenames with supported extensions
         """
         try:
-            print(f"\n=== Starting list_files in FileService ===")
+            logger.debug("=== Starting list_files in FileService ===")
             files = file_functions.list_files()
-            print("=== Ending list_files in FileService ===\n")
+            logger.debug("=== Ending list_files in FileService ===")
             return files
         except Exception as e:
-            print(f"Error listing files: {str(e)}")
+            logger.error("Error listing files: %s", e)
             raise e
 
 
@@ -46,13 +42,13 @@ class FileService:
             bool: True if file exists and is supported, False otherwise
         """
         try:
-            if not filename.lower().endswith(self._supported_extensions):
+            if not file_functions.has_supported_extension(filename):
                 return False
                 
             filepath = os.path.join(constants.DATA_DIR, filename)
             return os.path.exists(filepath)
         except Exception as e:
-            print(f"Error validating file: {str(e)}")
+            logger.error("Error validating file: %s", e)
             return False
 
     def get_or_load_file(self, filename: str, signal_idx: int = None) -> Any:
@@ -75,12 +71,14 @@ class FileService:
         """
         try:
             filepath = constants.full_filepath(filename)
-            print(f"Full filepath: {filepath}")
+            logger.debug("Full filepath: %s", filepath)
             
-            if not os.path.exists(filepath):
+            # The cache lookup stats the file (its key includes the mtime), which
+            # doubles as the existence check; a hit returns without loading
+            try:
+                signal = file_functions.get_cached_file(filepath, signal_idx)
+            except FileNotFoundError:
                 raise ValueError(f"File does not exist: {filepath}")
-        
-            signal = file_functions.get_cached_file(filepath, signal_idx)
             
             if signal is None:
                 signal = file_functions.load_file(filepath, signal_idx)
@@ -88,9 +86,7 @@ class FileService:
             return signal
             
         except Exception as e:
-            print(f"Error loading file {filename}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error loading file %s: %s", filename, e)
             raise
 
 
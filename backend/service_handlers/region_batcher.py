@@ -0,0 +1,84 @@
+"""
+Groups concurrent /region-spectrum requests for the same signal into one batch.
+
+Dragging a selection over the image fires a burst of region requests against the
+same (filename, signal_idx). Instead of sending each one to the process pool on
+its own, requests arriving within max_delay of the first are collected and sent
+as a single compute_workers.compute_region_spectra call: one round-trip to the
+pool, one file lookup, then one NumPy reduction per region.
+"""
+
+import asyncio
+from service_handlers import compute_workers
+
+
+class RegionSpectrumBatcher:
+    def __init__(self, runner, max_delay: float = 0.02, max_batch_size: int = 32):
+        """
+        Args:
+            runner: Coroutine function that runs a compute_workers function
+                    off the event loop (main.run_in_process_pool)
+            max_delay (float): Seconds to wait for more requests after the first one
+            max_batch_size (int): A batch is sent right away once it has this many regions
+        """
+        self._runner = runner
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self._pending = {}  # {(filename, signal_idx): (list of (region, future), timer handle)}
+        # The event loop only keeps weak references to tasks, so running batches
+        # are held here until they finish
+        self._tasks = set()
+
+    async def submit(self, filename: str, signal_idx: int, region: dict):
+        """
+        Queues one region and waits for its spectrum.
+
+        Args:
+            filename (str): Name of the file containing the signal
+            signal_idx (int): Index of the signal in the file
+            region (dict): x1, y1, x2, y2 coordinates
+
+        Returns:
+            dict: This region's entry of SignalService.get_spectra_from_2d_ranges
+        """
+        loop = asyncio.get_running_loop()
+        key = (filename, signal_idx)
+        future = loop.create_future()
+
+        if key not in self._pending:
+            handle = loop.call_later(self.max_delay, self._flush, key)
+            self._pending[key] = ([], handle)
+        batch, handle = self._pending[key]
+        batch.append((region, future))
+
+        if len(batch) >= self.max_batch_size:
+            handle.cancel()
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key):
+        """Sends the pending batch for key to the process pool"""
+        batch, _ = self._pending.pop(key, ([], None))
+        if batch:
+            task = asyncio.ensure_future(self._run(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key, batch):
+        filename, signal_idx = key
+        regions = [region for region, _ in batch]
+        try:
+            results = await self._runner(
+                compute_workers.compute_region_spectra, filename, signal_idx, regions
+            )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():  # The request was cancelled while waiting
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -1,11 +1,13 @@
 from operations import signal_functions, spectrum_functions, image_viewer_functions, data_functions
 from service_handlers.file_service import FileService
-from utils import constants
 import os
+import logging
 import numpy as np
-import hyperspy.api as hs
+from dataclasses import asdict
 from typing import List, Dict, Any, Tuple, Union
 
+logger = logging.getLogger(__name__)
+
 # FileService is a class that handles file operations
 
 class SignalService:
@@ -25,32 +27,28 @@ class SignalService:
             list: List of signals from the file
         """
         try:
-            print("\n=== Starting get_signal_list in SignalService ===")
-            print(f"Input filename: {filename}")
+            logger.debug("=== Starting get_signal_list in SignalService ===")
+            logger.debug("Input filename: %s", filename)
             
             #Get all signals from file
             signals = self.file_service.get_or_load_file(filename)
             
-            print("\nGetting signal titles...")
+            logger.debug("Getting signal titles...")
             # Get signal list
             try:
                 signal_list = signal_functions.extract_signal_list(signals)
-                print(f"Signal titles retrieved: {signal_list is not None}")
+                logger.debug("Signal titles retrieved: %s", signal_list is not None)
                 if signal_list:
-                    print(f"Number of signals found: {len(signal_list)}")
+                    logger.debug("Number of signals found: %s", len(signal_list))
             except Exception as e:
-                print(f"Error getting signal titles: {str(e)}")
+                logger.error("Error getting signal titles: %s", e)
                 raise
             
-            print("=== Ending get_signal_list in SignalService ===\n")
+            logger.debug("=== Ending get_signal_list in SignalService ===")
             return signal_list
             
         except Exception as e:
-            print(f"\nError in signal service: {str(e)}")
-            print(f"Error type: {type(e)}")
-            import traceback
-            print("Traceback:")
-            traceback.print_exc()
+            logger.exception("Error in signal service (%s): %s", type(e).__name__, e)
             raise e
 
     #############################################################################
@@ -75,7 +73,7 @@ class SignalService:
                 - zero_index: index where energy = 0 (or None if not found)
                 - fwhm_index: index at FWHM point after zero peak (or None if not found)
         """
-        print(f"\n=== Starting get_spectrum_data() in SignalService ===")
+        logger.debug("=== Starting get_spectrum_data() in SignalService ===")
         
         try:
             # Get signal from cache or load it
@@ -87,89 +85,90 @@ class SignalService:
             return spectrum_data
             
         except Exception as e:
-            print(f"Error in get_spectrum_data: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in get_spectrum_data: %s", e)
             raise
 
-    def get_spectrum_from_2d_range(self, filename: str, signal_idx: int, region: dict):
+    def get_spectra_from_2d_ranges(self, filename: str, signal_idx: int, regions: list):
         """
-        Gets spectrum data from a specific region of a 3D signal.
+        Gets the spectra of several regions of the same 3D signal in one pass
+        (see data_functions.sum_regions), e.g. for a batch of region requests.
+        Integer counts are summed exactly in 64 bit; float data is accumulated in
+        float64 so large regions don't lose precision.
         Args:
             filename (str): Name of the file
             signal_idx (int): Index of the signal
-            region (dict): Dictionary containing x1, y1, x2, y2 coordinates as floats
+            regions (list): Dictionaries containing x1, y1, x2, y2 coordinates as floats
         Returns:
-            dict: Dictionary containing:
+            list: One entry per region, in order: the exception raised for a bad
+                  region, or a dictionary containing:
                 - x: array of energy values
-                - y: array of intensity values
+                - y: array of intensity values (summed over the region)
                 - x_label: label for x-axis
                 - x_units: units for x-axis
                 - y_label: label for y-axis
         """
-        print(f"\n=== Starting get_spectrum_from_2d_range() in SignalService ===")
-        try:
-            # Get signal from cache or load it
-            signals = self.file_service.get_or_load_file(filename, signal_idx)
-            
-            # Extract the specific signal if we got a list
-            signal = signals[0] if isinstance(signals, list) else signals
-            
+        logger.debug("=== Starting get_spectra_from_2d_ranges() for %s regions ===", len(regions))
+        signal = self.file_service.get_or_load_file(filename, signal_idx)
+        height, width = self._region_signal_shape(signal)
+        
+        # A malformed region fails on its own instead of failing the batch
+        results = []
+        bounds = []
+        for region in regions:
+            try:
+                bounds.append(self._region_bounds(region, height, width))
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        
+        spectra = iter(data_functions.sum_regions(signal.data, bounds))
+        return [result if result is not None else self._region_spectrum(signal, next(spectra))
+                for result in results]
 
-            # Ensure we have a 3D signal
-            if len(signal.data.shape) != 3:
-                raise ValueError(f"Selected signal must be 3D for region selection. Got shape {signal.data.shape}")
+    def _region_signal_shape(self, signal):
+        """Checks that signal is a 3D datacube and returns its (height, width)"""
+        shape = signal.data.shape
+        if len(shape) != 3:
+            raise ValueError(f"Selected signal must be 3D for region selection. Got shape {shape}")
+        height, width, _ = shape
+        return height, width
 
-            # Extract coordinates as floats and convert to integers
-            x1 = int(float(region['x1']))
-            x2 = int(float(region['x2']))
-            y1 = int(float(region['y1']))
-            y2 = int(float(region['y2']))
-            
-            # Ensure coordinates are within bounds
-            height, width, spectrum_size = signal.data.shape
-            print(f"Signal dimensions - Height: {height}, Width: {width}, Spectrum: {spectrum_size}")
-            print(f"Requested region - X: {x1} to {x2}, Y: {y1} to {y2}")
-            
-            # Bound check and ensure correct order
-            x1 = max(0, min(x1, width))
-            x2 = max(0, min(x2, width))
-            y1 = max(0, min(y1, height))
-            y2 = max(0, min(y2, height))
-            x1, x2 = min(x1, x2), max(x1, x2)
-            y1, y2 = min(y1, y2), max(y1, y2)
-            
-            # Extract the region directly from the numpy array
-            region_data = signal.data[y1:y2, x1:x2, :]
-            
-            # Sum over the spatial dimensions (height, width)
-            summed_spectrum = region_data.sum(axis=(0, 1))
-            
-            # Get the x-axis values and labels from the signal's axes manager
-            axes_info = data_functions.load_axes_manager(signal)
-            if not axes_info:
-                raise ValueError("Could not load axes information")
-            
-            # Generate x values using axis parameters
-            x_values = np.arange(axes_info['size']) * axes_info['scale'] + axes_info['offset']
-            x_label = axes_info['name'] or "Energy"
-            x_units = axes_info['units'] or "keV"
-            y_label = "Intensity"
-            
-            # Return both x and y values along with axis information
-            return {
-                'x': x_values.tolist(),
-                'y': summed_spectrum.tolist(),
-                'x_label': x_label,
-                'x_units': x_units,
-                'y_label': y_label
-            }
-            
-        except Exception as e:
-            print(f"Error in get_spectrum_from_region: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise
+    def _region_bounds(self, region: dict, height: int, width: int):
+        """
+        Converts a region's x1, y1, x2, y2 (floats) to integer slice bounds
+        (y1, y2, x1, x2), clamped to the image and ordered.
+        Raises ValueError if no pixel of the region lies inside the image, rather
+        than returning an all-zero spectrum for it.
+        """
+        x1 = int(float(region['x1']))
+        x2 = int(float(region['x2']))
+        y1 = int(float(region['y1']))
+        y2 = int(float(region['y2']))
+        logger.debug("Requested region - X: %s to %s, Y: %s to %s", x1, x2, y1, y2)
+        
+        # Bound check and ensure correct order
+        x1, x2 = sorted((min(max(x1, 0), width), min(max(x2, 0), width)))
+        y1, y2 = sorted((min(max(y1, 0), height), min(max(y2, 0), height)))
+        if x2 <= x1 or y2 <= y1:
+            raise ValueError(f"Region lies outside the {width}x{height} image")
+        return y1, y2, x1, x2
+
+    def _region_spectrum(self, signal, summed_spectrum):
+        """Pairs a region's summed spectrum with the signal's energy axis and labels"""
+        # Get the x-axis values and labels from the signal's axes manager
+        axes_info = data_functions.load_axes_manager(signal)
+        if not axes_info:
+            raise ValueError("Could not load axes information")
+        
+        # Return both x and y values along with axis information
+        # Arrays are returned as-is, ORJSONResponse serializes them directly
+        return {
+            'x': data_functions.energy_axis(axes_info.offset, axes_info.scale, axes_info.size),
+            'y': summed_spectrum,
+            'x_label': axes_info.name or "Energy",
+            'x_units': axes_info.units or "keV",
+            'y_label': "Intensity"
+        }
 
 
     
@@ -188,7 +187,7 @@ class SignalService:
         Returns:
             dict: Dictionary containing the image data
         """
-        print(f"\n=== Starting get_image_data() from signal_service.py ===")
+        logger.debug("=== Starting get_image_data() from signal_service.py ===")
         try:
             # Get signal from cache or load it
             signal = self.file_service.get_or_load_file(filename, signal_idx)
@@ -196,23 +195,22 @@ class SignalService:
             return image_viewer_functions.extract_image_data(signal)
             
         except Exception as e:
-            print(f"Error extracting data from {filename}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            print("=== Ending get_image_data() with error ===\n")
+            logger.exception("Error extracting data from %s: %s", filename, e)
+            logger.debug("=== Ending get_image_data() with error ===")
             return None
 
 
-    async def spectrum_to_2d(
+    def spectrum_to_2d(
         self,
         filename: str,
         signal_idx: int,
         start: int,
         end: int
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Get a 2D image representing the sum of intensities within a specific energy range.
-        async allows other functions to run in the background while this one is running
+        Called from the process pool (see service_handlers/compute_workers.py) so the
+        reduction doesn't block the event loop
         
         Args:
             filename (str): Name of the file containing the signal
@@ -221,21 +219,18 @@ class SignalService:
             end (int): Ending energy channel index
             
         Returns:
-            List[List[float]]: 2D array representing the summed image over the energy range
+            np.ndarray: 2D array representing the summed image over the energy range
         """
-        print(f"=== Starting spectrum_to_2d() ===")
-        print(f"Parameters: filename={filename}, signal_idx={signal_idx}, start={start}, end={end}")
+        logger.debug("=== Starting spectrum_to_2d() ===")
+        logger.debug("Parameters: filename=%s, signal_idx=%s, start=%s, end=%s", filename, signal_idx, start, end)
         
         try:
             # Load the signal
-            filepath = constants.full_filepath(filename)
-            
-
             signal = self.file_service.get_or_load_file(filename, signal_idx)
             
             # Get the full 3D data
             signal_data = signal.data
-            print(f"Full signal data shape: {signal_data.shape}")
+            logger.debug("Full signal data shape: %s", signal_data.shape)
 
             # Validate range indices
             if start < 0 or end >= signal_data.shape[2] or start > end:
@@ -243,15 +238,17 @@ class SignalService:
             
             # Extract the energy range and sum along that axis
             range_data = signal_data[:, :, start:end + 1]
-            summed_image = np.sum(range_data, axis=2)
-            print(f"Summed image shape: {summed_image.shape}")
+            summed_image = data_functions.compute_array(range_data.sum(axis=2))
+            logger.debug("Summed image shape: %s", summed_image.shape)
             
-            print("=== Ending spectrum_to_2d() successfully ===\n")
-            return summed_image.tolist()
+            logger.debug("=== Ending spectrum_to_2d() successfully ===")
+            # Returned as an array: pickles cheaply back from the process pool
+            # and ORJSONResponse serializes it without building Python lists
+            return summed_image
             
         except Exception as e:
-            print(f"Error in spectrum_to_2d: {str(e)}")
-            print("=== Ending spectrum_to_2d() with error ===\n")
+            logger.error("Error in spectrum_to_2d: %s", e)
+            logger.debug("=== Ending spectrum_to_2d() with error ===")
             raise e
 
     #############################################################################
@@ -266,72 +263,64 @@ class SignalService:
         Returns:
             dict: Dictionary containing the HAADF data
         """
-        print(f"\n=== Starting get_haadf_data() in SignalService ===")
+        logger.debug("=== Starting get_haadf_data() in SignalService ===")
         try:
             # Get signals from cache or load it
             signals = self.file_service.get_or_load_file(filename)
             
-            # Get the signal list to find HAADF
-            signal_list = signal_functions.extract_signal_list(signals)
-            
-            # Find the HAADF signal
-            haadf_idx = None
-            for idx, signal_info in enumerate(signal_list):
-                if 'HAADF' in signal_info['title'].upper():
-                    haadf_idx = idx
-                    break
+            # The HAADF signal was located when the file was loaded
+            haadf_idx = signals.haadf_index
             
             if haadf_idx is None:
-                print("No HAADF signal found in file")
+                logger.debug("No HAADF signal found in file")
                 return None
                 
             # Get the HAADF signal
             signal_data = signals[haadf_idx]
             
             # Get the shape of the data
-            data_shape = signal_data.data.shape
+            haadf_data = signal_data.data
+            data_shape = haadf_data.shape
 
             # Handle different dimensionalities
             if len(data_shape) == 2:
                 # For 2D signals, use the data directly
-                image_data = signal_data.data
-                print("2D signal - using data directly")
+                image_data = data_functions.compute_array(haadf_data)
+                logger.debug("2D signal - using data directly")
             else:
                 raise ValueError(f"Unsupported data shape: {data_shape}")
                 
-            print(f"Image shape after processing: {image_data.shape}")
-            print(f"Data range after processing: min={image_data.min()}, max={image_data.max()}")
-            
-            # Store original data range before normalization
-            data_min = float(image_data.min())
-            data_max = float(image_data.max())
+            logger.debug("Image shape after processing: %s", image_data.shape)
             
             # Normalize the image data for display
             if image_data.size > 0:
-                normalized_data = (image_data - image_data.min()) / (image_data.max() - image_data.min())
+                # Store original data range before normalization. The image is scanned
+                # once for each bound and the normalization reuses them.
+                data_min = float(image_data.min())
+                data_max = float(image_data.max())
+                logger.debug("Data range after processing: min=%s, max=%s", data_min, data_max)
+                
+                normalized_data = (image_data - data_min) / ((data_max - data_min) or 1.0)
                 normalized_data = (normalized_data * 255).astype(np.uint8)
-                print(f"After normalization - range: min={normalized_data.min()}, max={normalized_data.max()}")
-                print(f"Final data type: {normalized_data.dtype}")
             else:
+                data_min = data_max = 0.0
                 normalized_data = image_data
             
             result = {
                 "data_shape": data_shape,
-                "image_data": normalized_data.tolist(),
+                "image_data": normalized_data,
                 "data_range": {
                     "min": data_min,
                     "max": data_max
                 }
             }
             
-            print("=== Ending get_haadf_data() successfully ===\n")
+            logger.debug("=== Ending get_haadf_data() successfully ===")
             return result
             
         except Exception as e:
-            print(f"Error extracting HAADF data from {filename}: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            print("=== Ending get_haadf_data() with error ===\n")
+            logger.exception("Error extracting HAADF data from %s: %s", filename, e)
+            logger.debug("=== Ending get_haadf_data() with error ===")
             return None
 
     #############################################################################
@@ -347,7 +336,7 @@ class SignalService:
         Returns:
             dict: Dictionary containing metadata
         """
-        print(f"\n=== Starting get_metadata() in SignalService ===")
+        logger.debug("=== Starting get_metadata() in SignalService ===")
         try:
             # Get signal from cache or load it
             signal = self.file_service.get_or_load_file(filename, signal_idx)
@@ -355,18 +344,16 @@ class SignalService:
             # Get the metadata
             if hasattr(signal, 'metadata'):
                 metadata = data_functions._convert_metadata_to_serializable(signal.metadata)
-                print("\nMetadata extracted successfully")
-                print("=== Ending get_metadata() successfully ===\n")
+                logger.debug("Metadata extracted successfully")
+                logger.debug("=== Ending get_metadata() successfully ===")
                 return metadata
             else:
-                print("No metadata found in signal")
+                logger.debug("No metadata found in signal")
                 return {}
             
         except Exception as e:
-            print(f"Error getting metadata: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            print("=== Ending get_metadata() with error ===\n")
+            logger.exception("Error getting metadata: %s", e)
+            logger.debug("=== Ending get_metadata() with error ===")
             return None
 
     def get_axes_data(self, filename, signal_idx):
@@ -378,34 +365,36 @@ class SignalService:
         Returns:
             dict: Dictionary containing axes data
         """
-        print(f"\n=== Starting get_axes_data() in SignalService ===")
+        logger.debug("=== Starting get_axes_data() in SignalService ===")
         try:
             # Get signal from cache or load it
             signal = self.file_service.get_or_load_file(filename, signal_idx)
 
-            if signal.data.ndim != 3:
-                print(f"Error getting axes data, incorrect number of dimensions: {signal.data.ndim}")
+            ndim = signal.data.ndim
+            if ndim != 3:
+                logger.error("Error getting axes data, incorrect number of dimensions: %s", ndim)
                 return None
             
             # Get the axes data
             if hasattr(signal, 'axes_manager'):
                 axes_data = data_functions.load_axes_manager(signal)
-                print("\nAxes data extracted successfully")
-                print("=== Ending get_axes_data() successfully ===\n")
+                if axes_data is not None:
+                    # Plain dict for the JSON response
+                    axes_data = asdict(axes_data)
+                logger.debug("Axes data extracted successfully")
+                logger.debug("=== Ending get_axes_data() successfully ===")
                 return axes_data
             else:
-                print("No axes data found in signal")
+                logger.debug("No axes data found in signal")
                 return {}
             
         except Exception as e:
-            print(f"Error getting axes data: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            print("=== Ending get_axes_data() with error ===\n")
+            logger.exception("Error getting axes data: %s", e)
+            logger.debug("=== Ending get_axes_data() with error ===")
             return None
 
 
-    async def get_emission_spectra_width_sum(
+    def get_emission_spectra_width_sum(
         self,
         filename: str,
         signal_idx: int,
@@ -425,9 +414,9 @@ class SignalService:
             Union[float, str]: Total sum of x-ray counts within the specified energy range,
                              or error message if range is outside spectrum
         """
-        print(f"=== Starting get_emission_spectra_width_sum() in signal_service.py ===")
-        print(f"Parameters: filename={filename}, signal_idx={signal_idx}")
-        print(f"Energy range: {start:.4f} keV to {end:.4f} keV")
+        logger.debug("=== Starting get_emission_spectra_width_sum() in signal_service.py ===")
+        logger.debug("Parameters: filename=%s, signal_idx=%s", filename, signal_idx)
+        logger.debug("Energy range: %.4f keV to %.4f keV", start, end)
         
         try:
             # Load the signal
@@ -438,7 +427,7 @@ class SignalService:
             max_energy = energy_axis.high_value
             min_energy = energy_axis.low_value
             
-            print(f"Signal energy range: {min_energy:.4f} to {max_energy:.4f} keV")
+            logger.debug("Signal energy range: %.4f to %.4f keV", min_energy, max_energy)
             
             # Check if the requested range is outside the signal's range
             if start > max_energy or end > max_energy:
@@ -446,17 +435,21 @@ class SignalService:
             if start < min_energy or end < min_energy:
                 return "Energy range below spectrum minimum"
             
-            # Use isig to select the energy range directly
-            signal_slice = signal.isig[start:end]
+            # Convert the energies to channel indices the same way signal.isig[start:end]
+            # does (rounded to the nearest channel), but slice the array directly
+            # instead of building a new HyperSpy signal for the slice
+            start_index, end_index = np.rint(
+                data_functions.energy_to_index((start, end), energy_axis.offset, energy_axis.scale)
+            ).astype(int)
             
             # Sum all counts in the selected range
-            total_counts = signal_slice.data.sum()
-            print(f"Total x-ray counts in range: {total_counts}")
+            total_counts = data_functions.compute_array(signal.data[..., start_index:end_index].sum())
+            logger.debug("Total x-ray counts in range: %s", total_counts)
             
-            print("=== Ending get_emission_spectra_width_sum() successfully ===\n")
+            logger.debug("=== Ending get_emission_spectra_width_sum() successfully ===")
             return float(total_counts)
             
         except Exception as e:
-            print(f"Error in get_emission_spectra_width_sum: {str(e)}")
-            print("=== Ending get_emission_spectra_width_sum() with error ===\n")
+            logger.error("Error in get_emission_spectra_width_sum: %s", e)
+            logger.debug("=== Ending get_emission_spectra_width_sum() with error ===")
             raise e
@@ -0,0 +1,97 @@
+import os
+import threading
+import numpy as np
+from cachetools import LRUCache
+from utils import constants
+
+
+# Payloads derived from data files (signal lists, metadata, HAADF images) only
+# change when the file on disk changes. They are cached per process, keyed on
+# the file's modification time, so a replaced file gets a new key and stale
+# entries simply age out of the LRU.
+# Payloads can hold whole images (HAADF), so like the signal cache the LRU is
+# bounded in bytes: MAX_BYTES of arrays in total, with every entry counted as at
+# least MAX_BYTES // MAX_ENTRIES so small payloads still cap at MAX_ENTRIES.
+MAX_ENTRIES = int(os.getenv("CRUCIBLE_RESPONSE_CACHE_SIZE", 256))
+MAX_BYTES = int(os.getenv("CRUCIBLE_RESPONSE_CACHE_BYTES", 256 << 20))
+_MIN_ENTRY_BYTES = MAX_BYTES // MAX_ENTRIES
+
+
+def _array_nbytes(payload):
+    """Bytes of the NumPy arrays in a payload, including those nested in dicts and lists"""
+    if isinstance(payload, np.ndarray):
+        return payload.nbytes
+    if isinstance(payload, dict):
+        return sum(_array_nbytes(value) for value in payload.values())
+    if isinstance(payload, (list, tuple)):
+        return sum(_array_nbytes(value) for value in payload)
+    return 0
+
+
+def _entry_size(payload):
+    return max(_array_nbytes(payload), _MIN_ENTRY_BYTES)
+
+
+_cache = LRUCache(maxsize=MAX_BYTES, getsizeof=_entry_size)
+_lock = threading.Lock()
+
+
+def file_stat(filename):
+    """
+    Stats a data file. Blocking filesystem I/O: async handlers call it through
+    run_in_threadpool, once per request, and pass the result to etag_for and
+    cached_call.
+
+    Args:
+        filename (str): Name of the file in the data directory
+
+    Returns:
+        os.stat_result: Stat of the file
+    """
+    return os.stat(constants.full_filepath(filename))
+
+
+def cached_call(kind, filename, signal_idx, mtime_ns, func, *args):
+    """
+    Returns the cached result of func(*args), computing it on a miss.
+
+    Args:
+        kind (str): Name of the payload (e.g. "metadata"), part of the cache key
+        filename (str): Name of the data file the payload is derived from
+        signal_idx (int or None): Index of the signal, None for whole-file payloads
+        mtime_ns (int): st_mtime_ns of the file (see file_stat)
+        func (callable): Service function that computes the payload
+        *args: Arguments passed to func
+
+    Returns:
+        The payload returned by func. None results (used by the services to
+        signal failures) and payloads over MAX_BYTES are returned but not cached.
+    """
+    key = (kind, filename, signal_idx, mtime_ns)
+    with _lock:
+        result = _cache.get(key)
+    if result is not None:
+        return result
+
+    result = func(*args)
+    # Payloads larger than the whole budget are returned without being cached
+    if result is not None and _entry_size(result) <= MAX_BYTES:
+        with _lock:
+            _cache[key] = result
+    return result
+
+
+def etag_for(st, *extra):
+    """
+    Builds a weak ETag for a payload derived from a data file.
+    Changes whenever the file is modified or replaced (mtime or size change).
+
+    Args:
+        st (os.stat_result): Stat of the data file (see file_stat)
+        *extra: Other request parameters the payload depends on (signal index, format...)
+
+    Returns:
+        str: ETag header value, e.g. W/"17a3c...-4f2a10-0-json"
+    """
+    parts = [f"{st.st_mtime_ns:x}", f"{st.st_size:x}", *map(str, extra)]
+    return 'W/"' + "-".join(parts) + '"'
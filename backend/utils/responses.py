@@ -0,0 +1,86 @@
+import json
+import numpy as np
+import orjson
+from fastapi.responses import Response
+
+
+BINARY_MEDIA_TYPE = "application/octet-stream"
+
+
+def _to_builtin(value):
+    """json.dumps fallback for NumPy arrays and scalars"""
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def array_response(array, metadata=None) -> Response:
+    """
+    Packs a NumPy array into a raw binary response instead of JSON.
+
+    The body is the array's little-endian bytes in C order. The shape and dtype
+    are sent as headers so the frontend can rebuild the array without parsing
+    text, e.g. new Float32Array(await response.arrayBuffer()).
+
+    Args:
+        array: NumPy array (or anything np.asarray accepts) to send
+        metadata (dict, optional): Non-array fields of the payload (labels, units,
+            data ranges...) sent as JSON in the X-Metadata header
+
+    Returns:
+        Response: application/octet-stream response with X-Shape, X-Dtype
+                  and (optionally) X-Metadata headers
+    """
+    array = np.asarray(array)
+
+    # JavaScript has no convenient typed array for 64-bit integers,
+    # so integer sums (e.g. uint16 counts summed to uint64) are sent as float64
+    if array.dtype.kind in "iu" and array.dtype.itemsize == 8:
+        array = array.astype(np.float64)
+
+    # Typed arrays in the browser are little-endian
+    array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+
+    headers = {
+        "X-Shape": orjson.dumps(list(array.shape)).decode(),
+        "X-Dtype": array.dtype.name,
+    }
+    if metadata:
+        # Header values are encoded as latin-1, so labels and units outside it
+        # (e.g. nm⁻¹) are sent as \u escapes; NumPy values become plain numbers
+        headers["X-Metadata"] = json.dumps(metadata, ensure_ascii=True, separators=(",", ":"),
+                                           default=_to_builtin)
+
+    return Response(content=array.tobytes(), media_type=BINARY_MEDIA_TYPE, headers=headers)
+
+
+def spectrum_array_response(spectrum_data: dict) -> Response:
+    """
+    Binary form of a spectrum payload ({'x': ..., 'y': ..., labels...}).
+    x and y are stacked into a single (2, N) float32 array; row 0 is x, row 1 is y.
+    All remaining keys are sent in the X-Metadata header.
+
+    Like images, spectra are only plotted, and float32 keeps ~7 significant digits,
+    far more than the viewer can show, in half the bytes of float64.
+    """
+    stacked = np.vstack((np.asarray(spectrum_data['x'], dtype=np.float32),
+                         np.asarray(spectrum_data['y'], dtype=np.float32)))
+    metadata = {key: value for key, value in spectrum_data.items() if key not in ('x', 'y')}
+    return array_response(stacked, metadata)
+
+
+def image_array_response(image_data: dict) -> Response:
+    """
+    Binary form of an image payload ({'image_data': ..., 'data_shape': ..., ...}).
+    The body carries image_data; all remaining keys go in the X-Metadata header.
+
+    Images are only displayed, so float and 64-bit integer pixels (e.g. counts
+    summed over the spectrum axis) are sent as float32, half the bytes of float64.
+    Narrow integer images (uint8 HAADF, uint16 detector data) are sent as they are;
+    their original data_range is in the metadata.
+    """
+    image = np.asarray(image_data['image_data'])
+    if image.dtype.kind == 'f' or image.dtype.itemsize == 8:
+        image = image.astype(np.float32)
+    metadata = {key: value for key, value in image_data.items() if key != 'image_data'}
+    return array_response(image, metadata)
@@ -12,8 +12,8 @@
  * 2. API -> Backend Flow:
  *    - This file uses axios to make HTTP requests to the FastAPI backend (main.py)
  *    - Each function corresponds to a specific endpoint in main.py
- *    - Requests are made to http://localhost:8000 (the FastAPI server)
- *    - Example: getSpectrum() calls GET /spectrum, which maps to @app.get("/spectrum") in main.py
+ *    - Requests are made to http://localhost:8000/api (the FastAPI server's API router)
+ *    - Example: getSpectrum() calls GET /api/spectrum, which maps to @api.get("/spectrum") in main.py
  * 
  * 3. Error Handling:
  *    - Each function includes try/catch blocks to handle network errors
@@ -31,7 +31,7 @@ import axios from 'axios';
  */
 
 const api = axios.create({
-  baseURL: import.meta.env.MODE === 'development' ? 'http://localhost:8000' : '',  // Use localhost in dev, relative URLs in production
+  baseURL: import.meta.env.MODE === 'development' ? 'http://localhost:8000/api' : '/api',  // All backend endpoints are served under /api
   headers: {
     'Content-Type': 'application/json',
     'Accept': 'application/json',
@@ -53,7 +53,7 @@ const api = axios.create({
 
 /**
  * Fetches list of all .emd files from the backend
- * Calls: GET http://localhost:8000/files
+ * Calls: GET http://localhost:8000/api/files
  * Returns: Array of filenames
  */
 export const getFiles = async () => {
@@ -70,7 +70,7 @@ export const getFiles = async () => {
 
 /**
  * Fetches all signals from a specific file
- * Calls: GET http://localhost:8000/signals?filename=<filename>
+ * Calls: GET http://localhost:8000/api/signals?filename=<filename>
  * @param filename - Name of the file to get signals from
  * Returns: Object containing array of signal information
  */
@@ -94,7 +94,7 @@ export const getSignals = async (filename: string) => {
 
 /**
  * Fetches spectrum data using the new format that includes both x and y values with units
- * Calls: GET http://localhost:8000/new-spectrum?filename=<filename>&signal_idx=<signal_idx>
+ * Calls: GET http://localhost:8000/api/spectrum?filename=<filename>&signal_idx=<signal_idx>
  * @param filename - Name of the file
  * @param signalIdx - Index of the signal in the file
  * Returns: Object containing:
@@ -118,7 +118,7 @@ export const getSpectrum = async (filename: string, signalIdx: number) => {
 
 /**
  * Fetches image data from a specific signal in a file
- * Calls: GET http://localhost:8000/image-data?filename=<filename>&signal_idx=<signal_idx>
+ * Calls: GET http://localhost:8000/api/image-data?filename=<filename>&signal_idx=<signal_idx>
  * @param filename - Name of the file
  * @param signalIdx - Index of the signal in the file
  * Returns: Object containing:
@@ -140,7 +140,7 @@ export const getImageData = async (filename: string, signalIdx: number) => {
 
 /**
  * Fetches haadf data from a specific signal in a file
- * Calls: GET http://localhost:8000/image-data?filename=<filename>&signal_idx=<signal_idx>
+ * Calls: GET http://localhost:8000/api/haadf-data?filename=<filename>
  * @param filename - Name of the file
  * Returns: Object containing:
  *  - data_shape: Shape of the image data
@@ -164,7 +164,7 @@ export const getHAADFData = async (filename: string ) => {
 
 /**
  * Fetches spectrum data from a selected region of a signal
- * Calls: GET http://localhost:8000/region-spectrum
+ * Calls: GET http://localhost:8000/api/region-spectrum
  * @param filename - Name of the file
  * @param signalIdx - Index of the signal in the file
  * @param region - Object containing x1, y1, x2, y2 coordinates of the selected region
@@ -195,7 +195,7 @@ export const getRegionSpectrum = async (
 
 /**
  * Fetches spectrum data from a selected range of energy channels
- * Calls: GET http://localhost:8000/energy-range-spectrum
+ * Calls: GET http://localhost:8000/api/energy-range-spectrum
  * @param filename - Name of the file
  * @param signalIdx - Index of the signal in the file
  * @param range - Object containing start and end indices of the energy range
@@ -254,7 +254,7 @@ export const getEmissionSpectraWidthSum = async (
 
 /**
  * Fetches metadata for a specific signal in a file
- * Calls: GET http://localhost:8000/metadata?filename=<filename>&signal_idx=<signal_idx>
+ * Calls: GET http://localhost:8000/api/metadata?filename=<filename>&signal_idx=<signal_idx>
  * @param filename - Name of the file
  * @param signalIdx - Index of the signal in the file
  * Returns: Object containing axes, shape, and metadata information
@@ -274,7 +274,7 @@ export const getMetadata = async (filename: string, signalIdx: number) => {
 
 /**
  * Fetches Axes manager data for a specific signal in a file
- * Calls: GET http://localhost:8000/axes-data?filename=<filename>&signal_idx=<signal_idx>
+ * Calls: GET http://localhost:8000/api/axes-data?filename=<filename>&signal_idx=<signal_idx>
  * @param filename - Name of the file
  * @param signalIdx - Index of the signal in the file
  * Returns: Object containing axes, shape, and metadata information
@@ -292,12 +292,53 @@ export const getAxesData = async (filename: string, signalIdx: number) => {
   }
 };
 
+/**
+ * Fetches signals, metadata, axes and spectrum for one signal in a single request
+ * Calls: GET http://localhost:8000/api/bundle?filename=<filename>&signal_idx=<signal_idx>
+ * @param filename - Name of the file
+ * @param signalIdx - Index of the signal in the file
+ * Returns: Object containing:
+ *  - signals: array of signal information (same as getSignals().signals)
+ *  - metadata: same as getMetadata()
+ *  - axes: same as getAxesData()
+ *  - spectrum: same as getSpectrum(), or null if the signal has no spectrum
+ */
+export const getBundle = async (filename: string, signalIdx: number) => {
+  try {
+    const response = await api.get('/bundle', {
+      params: { filename, signal_idx: signalIdx }
+    });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching bundle:', error);
+    throw error;
+  }
+};
+
+/**
+ * Sends several GET requests to the backend in a single round-trip
+ * Calls: POST http://localhost:8000/api/batch
+ * @param requests - Array of { id, url } where url is e.g. '/api/metadata?filename=a.emd&signal_idx=0'
+ * Returns: Array of { id, status, body } in the same order as the requests
+ */
+export const batchRequests = async (requests: { id: string; url: string }[]) => {
+  try {
+    const response = await api.post('/batch', {
+      requests: requests.map(request => ({ ...request, method: 'GET' }))
+    });
+    return response.data.responses;
+  } catch (error) {
+    console.error('Error sending batch request:', error);
+    throw error;
+  }
+};
+
 /**************************************************************************/
 /***************** Emission Line Analysis Functions ***********************/
 /**************************************************************************/
 /**
  * Fetches the zero peak width for a specific signal in a file
- * Calls: GET http://localhost:8000/zero-peak-width?filename=<filename>&signal_idx=<signal_idx>
+ * Calls: GET http://localhost:8000/api/zero-peak-width?filename=<filename>&signal_idx=<signal_idx>
  * @param filename - Name of the file
  * @param signalIdx - Index of the signal in the file
  * Returns: Object containing the zero peak width